@@ -0,0 +1,221 @@
+import json
+import shlex
+import sys
+import time
+from contextlib import redirect_stdout
+
+
+# Non-interactive command runner used by "python main.py --batch FILE".
+#
+# Each input line is one command, either JSON:
+#   {"cmd": "connect", "a": "Alice", "b": "Bob"}
+# or plain text with positional and key=value arguments:
+#   connect Alice Bob weight=2
+# key=value is only a keyword when key is one of the command's arguments,
+# so post_status Alice "x=y" posts "x=y".
+# Blank lines and lines starting with # are skipped.
+#
+# Each command writes one JSON line as soon as it finishes:
+#   {"line": 3, "cmd": "connect", "ok": true, "result": true, "ms": 0.012}
+
+
+def cmd_add_profile(pm, name, location="", relationship_status="", age=0,
+                    occupation="", astrological_sign="", status=""):
+    return pm.add_profile(name, location, relationship_status, int(age),
+                          occupation, astrological_sign, status)
+
+
+def cmd_load_csv(pm, path):
+    pm.read_profiles_from_csv(path)
+    return pm.graph.size()
+
+
+def cmd_sync_csv(pm, path):
+    return pm.sync_profiles_from_csv(path)
+
+
+def cmd_connect(pm, a, b, weight=0):
+    return pm.connect_profiles(a, b, int(weight))
+
+
+def cmd_disconnect(pm, a, b):
+    return pm.disconnect_profiles(a, b)
+
+
+def cmd_remove(pm, name):
+    return pm.remove_profile(name)
+
+
+def cmd_post_status(pm, name, status):
+    return pm.post_status(name, status)
+
+
+def cmd_profile(pm, name):
+    profile = pm.get_profile(name)
+    if profile is None:
+        return None
+    return {
+        "name": profile.get_name(),
+        "location": profile.get_location(),
+        "relationship_status": profile.get_relationship_status(),
+        "age": profile.get_age(),
+        "occupation": profile.get_occupation(),
+        "astrological_sign": profile.get_astrological_sign(),
+        "status": profile.get_status(),
+        "friends": list(profile.get_friends()),
+    }
+
+
+def cmd_profiles(pm):
+    return list(pm.display_profiles())
+
+
+def cmd_friends(pm, name):
+    profile = pm.get_profile(name)
+    return sorted(profile.get_friends()) if profile is not None else None
+
+
+def cmd_fof(pm, name):
+    return pm.get_friends_of_friends(name)
+
+
+def cmd_enable_two_hop(pm, degree_cap=None):
+    # degree_cap=none or an empty degree_cap= turns the cap off
+    if str(degree_cap).strip().lower() in ("", "none"):
+        degree_cap = None
+    pm.enable_two_hop_index(int(degree_cap) if degree_cap is not None else None)
+    return True
+
+
+def cmd_mutual(pm, a, b):
+    return pm.get_mutual_friend_count(a, b)
+
+
+def cmd_suggest(pm, name, limit=10):
+    return pm.get_friend_suggestions(name, int(limit))
+
+
+def cmd_bfs(pm, name):
+    return pm.graph.bfs(name)
+
+
+def cmd_dfs(pm, name):
+    return pm.graph.dfs(name)
+
+
+def cmd_enable_reach(pm, precision=8, max_hops=3, exact_limit=1000):
+    pm.enable_reach_estimator(int(precision), int(max_hops), int(exact_limit))
+    return True
+
+
+def cmd_reach(pm, name, hops=3):
+    return pm.estimate_reach(name, int(hops))
+
+
+def cmd_feed(pm, name, limit=20, before=None):
+    before = int(before) if before is not None else None
+    return pm.get_news_feed(name, int(limit), before)
+
+
+def cmd_export(pm, path, fmt=None):
+    from graph_export import export_graph
+
+    export_graph(pm.graph, path, fmt)
+    return path
+
+
+def cmd_graph(pm, user, depth=1, out=None):
+    if out is None:
+        out = f"{user}Network"
+    # create_user_graph prints progress; keep stdout for the JSON records
+    with redirect_stdout(sys.stderr):
+        return pm.create_user_graph(user, depth=int(depth), out_path=out)
+
+
+# name -> (handler, argument names in positional order)
+COMMANDS = {
+    "add_profile": (cmd_add_profile, ("name", "location", "relationship_status", "age",
+                                      "occupation", "astrological_sign", "status")),
+    "load_csv": (cmd_load_csv, ("path",)),
+    "sync_csv": (cmd_sync_csv, ("path",)),
+    "connect": (cmd_connect, ("a", "b", "weight")),
+    "disconnect": (cmd_disconnect, ("a", "b")),
+    "remove": (cmd_remove, ("name",)),
+    "post_status": (cmd_post_status, ("name", "status")),
+    "profile": (cmd_profile, ("name",)),
+    "profiles": (cmd_profiles, ()),
+    "friends": (cmd_friends, ("name",)),
+    "fof": (cmd_fof, ("name",)),
+    "enable_two_hop": (cmd_enable_two_hop, ("degree_cap",)),
+    "mutual": (cmd_mutual, ("a", "b")),
+    "suggest": (cmd_suggest, ("name", "limit")),
+    "bfs": (cmd_bfs, ("name",)),
+    "dfs": (cmd_dfs, ("name",)),
+    "enable_reach": (cmd_enable_reach, ("precision", "max_hops", "exact_limit")),
+    "reach": (cmd_reach, ("name", "hops")),
+    "feed": (cmd_feed, ("name", "limit", "before")),
+    "export": (cmd_export, ("path", "fmt")),
+    "graph": (cmd_graph, ("user", "depth", "out")),
+}
+
+
+def parse_command(line):
+    # Returns (command name, keyword arguments)
+    if line.startswith("{"):
+        data = json.loads(line)
+        name = data.pop("cmd", None)
+        positional = data.pop("args", [])
+        kwargs = data
+        tokens = []
+    else:
+        parts = shlex.split(line)
+        name = parts[0] if parts else None
+        positional = []
+        kwargs = {}
+        tokens = parts[1:]
+
+    if name not in COMMANDS:
+        raise ValueError(f"Unknown command: {name}")
+
+    _, arg_names = COMMANDS[name]
+    for token in tokens:
+        key, sep, value = token.partition("=")
+        if sep and key in arg_names:
+            kwargs[key] = value
+        else:
+            positional.append(token)
+
+    if len(positional) > len(arg_names):
+        raise ValueError(f"{name} takes at most {len(arg_names)} arguments")
+    for key, value in zip(arg_names, positional):
+        kwargs[key] = value
+    return name, kwargs
+
+
+def run_batch(pm, lines, out, stop_on_error=False):
+    # Runs every command in lines against pm; returns the number of errors
+    errors = 0
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        record = {"line": line_no}
+        start = time.perf_counter()
+        try:
+            name, kwargs = parse_command(line)
+            record["cmd"] = name
+            record["result"] = COMMANDS[name][0](pm, **kwargs)
+            record["ok"] = True
+        except Exception as e:
+            record["ok"] = False
+            record["error"] = f"{type(e).__name__}: {e}"
+            errors += 1
+        record["ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+        out.write(json.dumps(record, default=str) + "\n")
+        out.flush()
+
+        if errors and stop_on_error:
+            break
+    return errors
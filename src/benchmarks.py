@@ -0,0 +1,232 @@
+import csv
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+
+from profile_manager import ProfileManager
+from news_feed import NewsFeed
+from reach_sketch import ReachEstimator, exact_reach
+from sqlite_store import SQLiteBackend
+
+
+def timed(fn, *args, **kwargs):
+    # collect first so fn does not pay for garbage left by the setup
+    gc.collect()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def build_network(pm, num_users, avg_friends, num_hubs=0, hub_friends=0, seed=1):
+    # Random network with a few hub accounts that have many friends
+    rng = random.Random(seed)
+    names = [f"user{i}" for i in range(num_users)]
+    for name in names:
+        pm.add_profile(name, "", "", 0, "", "")
+
+    for _ in range(num_users * avg_friends // 2):
+        a, b = rng.sample(names, 2)
+        pm.connect_profiles(a, b)
+
+    for h in range(num_hubs):
+        hub = names[h]
+        for friend in rng.sample(names, min(hub_friends, num_users)):
+            if friend != hub:
+                pm.connect_profiles(hub, friend)
+
+    return names
+
+
+def bench_feed(num_users=5000, avg_friends=20, num_posts=20000, num_reads=5000):
+    # Compares fan-out-on-write, fan-out-on-read and hybrid timelines
+    pm = ProfileManager()
+    names = build_network(pm, num_users, avg_friends, num_hubs=5, hub_friends=num_users // 2)
+    rng = random.Random(2)
+    posters = [rng.choice(names) for _ in range(num_posts)]
+    readers = [rng.choice(names) for _ in range(num_reads)]
+
+    print(f"feed: {num_users} users, {num_posts} posts, {num_reads} timeline reads")
+    for strategy in ("push", "pull", "hybrid"):
+        feed = NewsFeed(pm.graph, strategy=strategy,
+                        celebrity_threshold=avg_friends * 10)
+
+        def post_all():
+            for author in posters:
+                feed.post(author, "status")
+
+        def read_all():
+            for reader in readers:
+                page = feed.get_timeline(reader, 20)
+                if page:
+                    feed.get_timeline(reader, 20, before=page[-1][0])
+
+        write_s, _ = timed(post_all)
+        read_s, _ = timed(read_all)
+        print(f"  {strategy:6}  write {write_s * 1e6 / num_posts:8.1f} us/post"
+              f"  read {read_s * 1e6 / (2 * num_reads):8.1f} us/page")
+
+
+def bench_storage(num_users=20000, avg_friends=10, num_queries=5000, cache_size=2000):
+    # Compares the in-memory ADTs with the SQLite backend
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        backend = SQLiteBackend(os.path.join(tmp_dir, "bench.db"),
+                                profile_cache_size=cache_size,
+                                adjacency_cache_size=cache_size)
+        try:
+            print(f"storage: {num_users} users, ~{num_users * avg_friends // 2} edges,"
+                  f" {num_queries} queries, cache {cache_size}")
+            for label, pm in (("memory", ProfileManager()),
+                              ("sqlite", ProfileManager(backend=backend))):
+                def load():
+                    with pm.batch():
+                        return build_network(pm, num_users, avg_friends)
+
+                load_s, names = timed(load)
+                rng = random.Random(3)
+                sample = [rng.choice(names) for _ in range(num_queries)]
+
+                def get_all():
+                    for name in sample:
+                        pm.get_profile(name)
+
+                def fof_all():
+                    for name in sample:
+                        pm.get_friends_of_friends(name)
+
+                def connect_all():
+                    for i in range(0, len(sample) - 1, 2):
+                        pm.connect_profiles(sample[i], sample[i + 1])
+
+                get_s, _ = timed(get_all)
+                fof_s, _ = timed(fof_all)
+                connect_s, _ = timed(connect_all)
+                print(f"  {label:6}  load {load_s:6.2f} s"
+                      f"  get_profile {get_s * 1e6 / num_queries:8.1f} us"
+                      f"  fof {fof_s * 1e6 / num_queries:8.1f} us"
+                      f"  connect (autocommit) {connect_s * 2e6 / num_queries:8.1f} us")
+        finally:
+            # close before the directory is removed
+            backend.close()
+
+
+def write_profiles_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "status", "picture", "location", "relationship_status",
+                         "age", "occupation", "astrological_sign", "friends"])
+        writer.writerows(rows.values())
+
+
+def bench_reimport(num_users=50000, avg_friends=10, change_ratio=0.01):
+    # Full CSV load vs incremental re-import of a file with change_ratio rows edited
+    rng = random.Random(4)
+    names = [f"user{i}" for i in range(num_users)]
+    rows = {}
+    for name in names:
+        friends = "|".join(rng.sample(names, avg_friends // 2))
+        rows[name] = [name, "status", "", "Seattle", "Single", str(rng.randint(18, 80)),
+                      "Engineer", "Aries", friends]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "profiles.csv")
+        write_profiles_csv(path, rows)
+
+        pm = ProfileManager()
+        first_s, _ = timed(pm.sync_profiles_from_csv, path)
+
+        for name in rng.sample(names, int(num_users * change_ratio)):
+            if rng.random() < 0.5:
+                rows[name][5] = str(rng.randint(18, 80))
+            else:
+                rows[name][8] = "|".join(rng.sample(names, avg_friends // 2))
+        write_profiles_csv(path, rows)
+
+        full_s, _ = timed(ProfileManager().read_profiles_from_csv, path)
+        delta_s, summary = timed(pm.sync_profiles_from_csv, path)
+
+        print(f"reimport: {num_users} rows, {change_ratio:.0%} changed")
+        print(f"  first sync {first_s:6.2f} s  full reload {full_s:6.2f} s"
+              f"  delta sync {delta_s:6.2f} s ({delta_s / full_s:.1%} of full)")
+        print(f"  {summary}")
+
+
+def bench_reach(num_users=5000, avg_friends=10, hops=3, num_queries=200):
+    # Exact BFS reach vs HyperLogLog estimates
+    pm = ProfileManager()
+    names = build_network(pm, num_users, avg_friends, num_hubs=5, hub_friends=num_users // 5)
+    sample = random.Random(5).sample(names, num_queries)
+
+    exact_s, exact = timed(lambda: {n: exact_reach(pm.graph, n, hops) for n in sample})
+    print(f"reach: {num_users} users, {hops} hops, exact BFS"
+          f" {exact_s * 1e3 / num_queries:8.2f} ms/user")
+
+    for precision in (6, 8, 10):
+        estimator = ReachEstimator(pm.graph, precision, hops, exact_limit=0)
+        build_s, _ = timed(estimator.build)
+        query_s, estimates = timed(estimator.reach_all, hops)
+        error = sum(abs(estimates[n] - exact[n]) / max(exact[n], 1) for n in sample) / num_queries
+        print(f"  precision {precision:2}  build {build_s:6.2f} s"
+              f"  all users {query_s * 1e6 / num_users:6.1f} us/user  mean error {error:.1%}")
+
+
+def bench_two_hop(num_users=20000, avg_friends=10, num_queries=2000, degree_cap=200):
+    # Friends-of-friends and mutual friend counts by traversal vs the two-hop index
+    pm = ProfileManager()
+    names = build_network(pm, num_users, avg_friends, num_hubs=5, hub_friends=num_users // 4)
+    hubs = set(names[:5])
+    rng = random.Random(6)
+    pairs = [rng.sample(names, 2) for _ in range(num_queries)]
+    hub_pairs = [(rng.choice(names[:5]), rng.choice(names)) for _ in range(num_queries)]
+
+    # next to a hub, traversal walks the hub's friends; the capped index
+    # leaves out people reached only through the hub, so it answers a
+    # different question there. An uncapped index would hold deg^2 pairs
+    # per hub, which does not fit this network.
+    plain, near_hub = [], []
+    for name in names:
+        friends = set(pm.get_profile(name).get_friends())
+        (near_hub if friends & hubs else plain).append(name)
+    plain = plain[:num_queries]
+    near_hub = near_hub[:num_queries]
+
+    def run_queries():
+        results = []
+        for label, fn, args in (("fof", pm.get_friends_of_friends, [(n,) for n in plain]),
+                                ("fof near hub", pm.get_friends_of_friends, [(n,) for n in near_hub]),
+                                ("mutual", pm.get_mutual_friend_count, pairs),
+                                ("mutual with hub", pm.get_mutual_friend_count, hub_pairs)):
+            elapsed, answers = timed(lambda: [fn(*a) for a in args])
+            results.append((label, elapsed * 1e6 / max(len(args), 1), answers))
+        return results
+
+    print(f"two_hop: {num_users} users, 5 hubs with {num_users // 4} friends,"
+          f" degree cap {degree_cap}")
+    traversal = run_queries()
+    build_s, _ = timed(pm.enable_two_hop_index, degree_cap)
+    indexed = run_queries()
+    update_s, _ = timed(lambda: [pm.connect_profiles(a, b) for a, b in pairs])
+
+    for (label, before, expected), (_, after, answers) in zip(traversal, indexed):
+        # rows whose answers differ compare a cheaper, smaller result
+        differ = sum(a != b for a, b in zip(expected, answers))
+        note = f"  results differ in {differ}/{len(answers)}" if differ else "  same results"
+        print(f"  {label:16} traversal {before:8.1f} us  capped index {after:8.1f} us{note}")
+    print(f"  index build {build_s:5.2f} s  connect {update_s * 1e6 / num_queries:6.1f} us")
+
+
+BENCHMARKS = {
+    "feed": bench_feed,
+    "storage": bench_storage,
+    "reimport": bench_reimport,
+    "reach": bench_reach,
+    "two_hop": bench_two_hop,
+}
+
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for bench_name in selected:
+        BENCHMARKS[bench_name]()
@@ -0,0 +1,168 @@
+import csv
+import hashlib
+
+
+# Building blocks for ProfileManager.sync_profiles_from_csv.
+#
+# Each raw CSV record (bytes, one or more lines) is hashed. The hashes and a
+# short entry per profile are kept by an import store that belongs to the
+# ProfileManager's storage: MemoryImportStore for the in-memory ADTs,
+# sqlite_store.SQLiteImportStore for the SQLite backend. A sync therefore
+# only trusts what it knows about profiles that this store loaded itself.
+#
+# entry = "record hash\tattributes hash\tfriends hash\tfriend|friend"; plain
+# strings keep a large import state out of the garbage collector's way.
+#
+# Runtime notes (n = records, c = changed records):
+# read_csv_records: O(file size)
+# scan_records: O(n), one hash and one dict lookup per record
+# parse_changed: O(c)
+
+# add_profile / update_profile fields that come from a CSV row
+PROFILE_FIELDS = ("location", "relationship_status", "age", "occupation",
+                  "astrological_sign", "status")
+
+
+def parse_profile_row(row):
+    # Returns (name, attrs, friends) for one csv.DictReader row
+    name = (row.get("name") or "").strip()
+
+    attrs = {}
+    for key in PROFILE_FIELDS:
+        attrs[key] = (row.get(key) or "").strip()
+
+    try:
+        attrs["age"] = int(attrs["age"]) if attrs["age"] else 0
+    except ValueError:
+        attrs["age"] = 0
+
+    friends = []
+    for friend in (row.get("friends") or "").split("|"):
+        friend = friend.strip()
+        if friend and friend != name and friend not in friends:
+            friends.append(friend)
+
+    return name, attrs, friends
+
+
+def fingerprint(data):
+    # Hash of raw bytes, as hex
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def fields_fingerprint(values):
+    return fingerprint("\x1f".join(map(str, values)).encode("utf-8"))
+
+
+def make_entry(record_fp, attrs_fp, friends_fp, friends):
+    return "\t".join((record_fp, attrs_fp, friends_fp, "|".join(friends)))
+
+
+def split_entry(entry):
+    # Returns (record hash, attributes hash, friends hash, friends)
+    record_fp, attrs_fp, friends_fp, friends = entry.split("\t", 3)
+    return record_fp, attrs_fp, friends_fp, friends.split("|") if friends else []
+
+
+def split_records(data):
+    # Raw CSV records of data (bytes); a quoted field may span several lines
+    lines = data.splitlines()
+    if b'"' not in data:
+        return lines
+
+    records = []
+    parts = None
+    for line in lines:
+        if parts is None:
+            parts = [line]
+            quotes = line.count(b'"')
+        else:
+            parts.append(line)
+            quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            records.append(parts[0] if len(parts) == 1 else b"\n".join(parts))
+            parts = None
+    if parts is not None:
+        records.append(b"\n".join(parts))
+    return records
+
+
+def read_csv_records(path):
+    # Returns (header, header hash, raw records after the header)
+    with open(path, "rb") as f:
+        records = split_records(f.read())
+    header_line = records[0] if records else b""
+    header = next(csv.reader([header_line.decode("utf-8")]), [])
+    return header, fingerprint(header_line), records[1:]
+
+
+def scan_records(records, known):
+    # Splits records by their hash. known: record hash -> name.
+    # Returns ({name: index of its unchanged record}, [indexes to parse])
+    matched = {}
+    changed = []
+    blake2b = hashlib.blake2b
+    for i, record in enumerate(records):
+        if not record:
+            continue
+        name = known.get(blake2b(record, digest_size=8).hexdigest())
+        if name is None or name in matched:
+            changed.append(i)
+        else:
+            matched[name] = i
+    return matched, changed
+
+
+def parse_changed(header, records, changed, matched):
+    # Parses the changed records. A name that shows up again, changed or
+    # not, is merged like read_profiles_from_csv does: first row's
+    # attributes, friends from every row; its hash covers all its records.
+    # Returns {name: (record hash, attrs, friends)}; names merged here are
+    # removed from matched.
+    name_col = header.index("name")
+    rows = {}   # name -> [(index, row)]
+    reader = csv.reader(records[i].decode("utf-8") for i in changed)
+    for i, row in zip(changed, reader):
+        name = row[name_col].strip() if len(row) > name_col else ""
+        if name:
+            rows.setdefault(name, []).append((i, row))
+
+    for name in rows.keys() & matched.keys():
+        i = matched.pop(name)
+        rows[name].append((i, next(csv.reader([records[i].decode("utf-8")]))))
+        rows[name].sort(key=lambda part: part[0])
+
+    pending = {}
+    for name, parts in rows.items():
+        _, attrs, friends = parse_profile_row(dict(zip(header, parts[0][1])))
+        for _, row in parts[1:]:
+            for friend in parse_profile_row(dict(zip(header, row)))[2]:
+                if friend not in friends:
+                    friends.append(friend)
+        record_fp = fingerprint(b"\n".join(records[i] for i, _ in parts))
+        pending[name] = (record_fp, attrs, friends)
+    return pending
+
+
+class MemoryImportStore:
+    # Import state for in-memory profiles; it lives and dies with them.
+    # load hands out the stored dicts themselves, sync updates them in place.
+
+    def __init__(self):
+        self.sources = {}   # csv path -> (header hash, {record hash: name}, {name: entry})
+
+    def load(self, source):
+        # Returns (header hash or None, {record hash: name}, {name: entry})
+        return self.sources.get(source, (None, {}, {}))
+
+    def save(self, source, header_fp, known, entries, changed, removed):
+        self.sources[source] = (header_fp, known, entries)
+
+    def forget(self, name):
+        # name's profile is gone: a later sync has to treat it as new
+        for _, known, entries in self.sources.values():
+            entry = entries.pop(name, None)
+            if entry is not None:
+                record_fp = entry.partition("\t")[0]
+                if known.get(record_fp) == name:
+                    del known[record_fp]
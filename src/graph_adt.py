@@ -27,6 +27,9 @@ class UndirectedGraph:
     # Runtime notes:
     # add_vertex: O(1) average
     # add_edge: O(1) average
+    # remove_edge: O(1) average
+    # remove_vertex: O(deg)
+    # iter_edges: O(V + E), O(1) extra memory
     # bfs: O(V + E)
     # dfs: O(V + E)
 
@@ -55,9 +58,39 @@ class UndirectedGraph:
         v1.add_neighbor(v2, weight)
         v2.add_neighbor(v1, weight)
 
+    def has_edge(self, from_key, to_key):
+        v1 = self.vert_list.get(from_key)
+        v2 = self.vert_list.get(to_key)
+        return v1 is not None and v2 is not None and v2 in v1.connected_to
+
+    def remove_edge(self, from_key, to_key):
+        # undirected: remove both directions
+        if not self.has_edge(from_key, to_key):
+            return False
+
+        v1 = self.vert_list[from_key]
+        v2 = self.vert_list[to_key]
+        v1.connected_to.pop(v2, None)
+        v2.connected_to.pop(v1, None)
+        return True
+
+    def remove_vertex(self, key):
+        vertex = self.vert_list.get(key)
+        if vertex is None:
+            return False
+
+        for nbr in list(vertex.get_connections()):
+            nbr.connected_to.pop(vertex, None)
+        del self.vert_list[key]
+        self.num_vertices -= 1
+        return True
+
     def get_vertices(self):
         return list(self.vert_list.keys())
 
+    def iter_vertices(self):
+        return iter(self.vert_list)
+
     def contains(self, key):
         return key in self.vert_list
 
@@ -71,22 +104,21 @@ class UndirectedGraph:
     def size(self):
         return self.num_vertices
 
-    def get_edges(self):
-        # returns a list of tuples (from, to, weight) without duplicates
-        edges = []
-        seen = set()
+    def iter_edges(self):
+        # Yields each undirected edge once as (from, to, weight) with from <= to
         for from_key, vertex in self.vert_list.items():
-            for nbr in vertex.get_connections():
+            for nbr, weight in vertex.connected_to.items():
                 to_key = nbr.get_id()
-                pair = tuple([from_key, to_key])
-                if pair not in seen:
-                    seen.add(pair)
-                    edges.append((from_key, to_key, vertex.get_weight(nbr)))
-        return edges
+                if from_key <= to_key:
+                    yield (from_key, to_key, weight)
+
+    def get_edges(self):
+        # returns a list of tuples (from, to, weight) without duplicates
+        return list(self.iter_edges())
 
     def bfs(self, start):
         # Uses LinkedQueue (required)
-        if start not in self.vert_list:
+        if not self.contains(start):
             return []
 
         visited = set()
@@ -100,7 +132,7 @@ class UndirectedGraph:
             current_key = q.dequeue()
             order.append(current_key)
 
-            current_vertex = self.vert_list[current_key]
+            current_vertex = self.get_vertex(current_key)
             for nbr in current_vertex.get_connections():
                 nbr_key = nbr.get_id()
                 if nbr_key not in visited:
@@ -111,7 +143,7 @@ class UndirectedGraph:
 
     def dfs(self, start):
         # iterative DFS to keep it simple
-        if start not in self.vert_list:
+        if not self.contains(start):
             return []
 
         visited = set()
@@ -125,7 +157,7 @@ class UndirectedGraph:
             visited.add(current_key)
             order.append(current_key)
 
-            current_vertex = self.vert_list[current_key]
+            current_vertex = self.get_vertex(current_key)
             # push neighbors (reversed for more stable output ordering)
             neighbors = [nbr.get_id() for nbr in current_vertex.get_connections()]
             neighbors.sort(reverse=True)
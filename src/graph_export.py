@@ -0,0 +1,171 @@
+import csv
+import os
+import struct
+from xml.sax.saxutils import escape, quoteattr
+
+from graph_adt import UndirectedGraph
+
+
+# Streaming writers for the full graph. Edges come from
+# UndirectedGraph.iter_edges, so each undirected edge is written once and
+# only chunk_size lines are buffered at a time.
+#
+# Runtime: O(V + E) for every format
+# Memory: O(chunk_size), plus O(V) for the vertex index of the binary format
+
+CHUNK_SIZE = 10000
+
+BINARY_MAGIC = b"SMNG"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sBI")     # magic, version, vertex count
+_NAME_LEN = struct.Struct("<I")
+_EDGE_COUNT = struct.Struct("<Q")
+_EDGE = struct.Struct("<IId")        # from index, to index, weight
+
+
+def _write_chunked(f, lines, chunk_size):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            f.write("".join(chunk))
+            chunk = []
+    if chunk:
+        f.write("".join(chunk))
+
+
+def _dot_quote(value):
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def write_edge_csv(graph, path, chunk_size=CHUNK_SIZE):
+    # from,to,weight per line
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["from", "to", "weight"])
+        chunk = []
+        for edge in graph.iter_edges():
+            chunk.append(edge)
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                count += len(chunk)
+                chunk = []
+        writer.writerows(chunk)
+        count += len(chunk)
+    return count
+
+
+def write_dot(graph, path, name="Network", chunk_size=CHUNK_SIZE):
+    def lines():
+        yield f"graph {_dot_quote(name)} {{\n"
+        for key in graph.iter_vertices():
+            yield f"  {_dot_quote(key)};\n"
+        for u, v, w in graph.iter_edges():
+            label = f" [label={_dot_quote(w)}]" if w not in (None, 0) else ""
+            yield f"  {_dot_quote(u)} -- {_dot_quote(v)}{label};\n"
+        yield "}\n"
+
+    with open(path, "w", encoding="utf-8") as f:
+        _write_chunked(f, lines(), chunk_size)
+    return path
+
+
+def write_graphml(graph, path, chunk_size=CHUNK_SIZE):
+    def lines():
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        yield '  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n'
+        yield '  <graph id="Network" edgedefault="undirected">\n'
+        for key in graph.iter_vertices():
+            yield f"    <node id={quoteattr(str(key))}/>\n"
+        for u, v, w in graph.iter_edges():
+            yield (f"    <edge source={quoteattr(str(u))} target={quoteattr(str(v))}>"
+                   f'<data key="weight">{escape(str(w))}</data></edge>\n')
+        yield "  </graph>\n"
+        yield "</graphml>\n"
+
+    with open(path, "w", encoding="utf-8") as f:
+        _write_chunked(f, lines(), chunk_size)
+    return path
+
+
+def write_binary(graph, path, chunk_size=CHUNK_SIZE):
+    # Layout (little endian):
+    #   header: magic, version (u8), vertex count (u32)
+    #   vertices: name length (u32) + utf-8 name, repeated
+    #   edge count (u64), then (from index u32, to index u32, weight f64) records
+    index = {}
+    count = 0
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, graph.size()))
+        for key in graph.iter_vertices():
+            data = str(key).encode("utf-8")
+            f.write(_NAME_LEN.pack(len(data)))
+            f.write(data)
+            index[key] = len(index)
+
+        count_pos = f.tell()
+        f.write(_EDGE_COUNT.pack(0))
+
+        chunk = bytearray()
+        for u, v, w in graph.iter_edges():
+            chunk += _EDGE.pack(index[u], index[v], float(w or 0))
+            count += 1
+            if count % chunk_size == 0:
+                f.write(chunk)
+                chunk = bytearray()
+        f.write(chunk)
+
+        # the edge count is only known once the stream is done
+        f.seek(count_pos)
+        f.write(_EDGE_COUNT.pack(count))
+    return count
+
+
+def read_binary(path, graph=None, chunk_size=CHUNK_SIZE):
+    # Loads a file written by write_binary into graph (a new one by default)
+    if graph is None:
+        graph = UndirectedGraph()
+
+    with open(path, "rb") as f:
+        magic, version, num_vertices = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f"Not a graph binary file: {path}")
+
+        names = []
+        for _ in range(num_vertices):
+            (length,) = _NAME_LEN.unpack(f.read(_NAME_LEN.size))
+            name = f.read(length).decode("utf-8")
+            names.append(name)
+            graph.add_vertex(name)
+
+        (num_edges,) = _EDGE_COUNT.unpack(f.read(_EDGE_COUNT.size))
+        remaining = num_edges
+        while remaining:
+            batch = min(remaining, chunk_size)
+            data = f.read(batch * _EDGE.size)
+            for u, v, w in _EDGE.iter_unpack(data):
+                graph.add_edge(names[u], names[v], int(w) if w.is_integer() else w)
+            remaining -= batch
+
+    return graph
+
+
+WRITERS = {
+    "csv": write_edge_csv,
+    "dot": write_dot,
+    "graphml": write_graphml,
+    "bin": write_binary,
+}
+
+
+def export_graph(graph, path, fmt=None, chunk_size=CHUNK_SIZE):
+    # Picks the writer from fmt or the file extension; a path without an
+    # extension gets an edge-list CSV
+    if fmt is None:
+        fmt = os.path.splitext(path)[1][1:].lower() or "csv"
+    writer = WRITERS.get(fmt)
+    if writer is None:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return writer(graph, path, chunk_size=chunk_size)
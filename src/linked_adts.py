@@ -30,4 +30,37 @@ class LinkedQueue:
         return None
 
     def is_empty(self):
-        return len(self.queue) == 0
\ No newline at end of file
+        return len(self.queue) == 0
+
+class RingBuffer:
+    # Fixed-capacity buffer that overwrites its oldest item when full
+    # Runtime:
+    # append: O(1)
+    # get: O(1)
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.items = [None] * capacity
+        self.start = 0   # index of the oldest item
+        self.count = 0
+
+    def append(self, item):
+        end = (self.start + self.count) % self.capacity
+        self.items[end] = item
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def get(self, i):
+        # i = 0 is the newest item
+        if i < 0 or i >= self.count:
+            return None
+        return self.items[(self.start + self.count - 1 - i) % self.capacity]
+
+    def is_empty(self):
+        return self.count == 0
+
+    def size(self):
+        return self.count
@@ -130,7 +130,7 @@ def modify_profile_flow(pm, current_user):
 
     if choice == 1:
         new_status = input("Enter new status: ").strip()
-        p.set_status(new_status)
+        pm.post_status(current_user, new_status)
         print("Status updated.")
 
 
@@ -240,8 +240,11 @@ def switch_user_flow(pm):
 def read_csv_flow(pm):
     path = prompt_nonempty("Enter CSV file path: ").strip()
     try:
-        pm.read_profiles_from_csv(path)
+        # only rows that changed since the last load of this file are applied
+        summary = pm.sync_profiles_from_csv(path)
         print("CSV loaded.")
+        print(f"Added {summary['added']}, changed {summary['changed']}, "
+              f"removed {summary['removed']} profiles.")
     except Exception as e:
         print("Error reading CSV:", e)
         return None
@@ -259,8 +262,9 @@ def create_graph_flow(pm, current_user):
     pm.create_user_graph(current_user, depth=depth, out_path=f"{current_user}Network")
 
 
-def run():
-    pm = ProfileManager()
+def run(pm=None):
+    if pm is None:
+        pm = ProfileManager()
 
     print("Welcome to Social Media Network")
     mode = input("Login as ADMIN or USER? ").strip().upper()
@@ -343,5 +347,54 @@ def run():
             break
 
 
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Social Media Network")
+    parser.add_argument("--db", help="store profiles in this SQLite database instead of memory")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run commands from FILE (- for stdin) instead of the menu")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write batch results to FILE instead of stdout")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="stop the batch at the first failing command")
+    args = parser.parse_args(argv)
+
+    # sqlite_store and batch are imported only by the mode that needs them
+    backend = None
+    if args.db:
+        from sqlite_store import SQLiteBackend
+
+        backend = SQLiteBackend(args.db)
+    pm = ProfileManager(backend=backend)
+
+    try:
+        if args.batch:
+            return run_batch_file(pm, args.batch, args.output, args.stop_on_error)
+        run(pm)
+        return 0
+    finally:
+        if backend is not None:
+            backend.close()
+
+
+def run_batch_file(pm, path, output=None, stop_on_error=False):
+    import sys
+    from batch import run_batch
+
+    inp = out = None
+    try:
+        inp = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        out = sys.stdout if output is None else open(output, "w", encoding="utf-8")
+        errors = run_batch(pm, inp, out, stop_on_error)
+    finally:
+        # a bad output path must not leak the already opened input
+        if inp is not None and inp is not sys.stdin:
+            inp.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+    return 1 if errors else 0
+
+
 if __name__ == "__main__":
-    run()
+    raise SystemExit(main())
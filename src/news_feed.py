@@ -0,0 +1,167 @@
+import heapq
+from itertools import islice
+
+from linked_adts import RingBuffer
+
+
+STRATEGIES = ("push", "pull", "hybrid")
+
+
+class NewsFeed:
+    # Status updates are stored as tuples (seq, author, text); seq is a global
+    # counter so newer updates always have a larger seq.
+    #
+    # Strategies:
+    # push   - every post is copied into each friend's timeline (fan-out-on-write)
+    # pull   - timelines are merged from friends' histories on read (fan-out-on-read)
+    # hybrid - push for normal users, pull for authors with more than
+    #          celebrity_threshold friends
+    #
+    # Runtime notes:
+    # post: O(1) for pulled authors, O(deg) for pushed authors
+    # get_history: O(log n + page size)
+    # get_timeline (push): O(log n + page size)
+    # get_timeline (pull): O(k + page size * log k), k = friends merged
+    # get_timeline (hybrid): adds min(deg, celebrities) friendship checks
+    # get_timeline (all): plus one friendship check per update read, so
+    #     pushed copies from former friends and removed users are skipped
+
+    def __init__(self, graph, history_size=50, timeline_size=200,
+                 celebrity_threshold=1000, strategy="hybrid"):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown feed strategy: {strategy}")
+        self.graph = graph
+        self.history_size = history_size
+        self.timeline_size = timeline_size
+        self.celebrity_threshold = celebrity_threshold
+        self.strategy = strategy
+        self.histories = {}      # name -> RingBuffer of own updates
+        self.timelines = {}      # name -> RingBuffer of pushed friend updates
+        self.celebrities = {}    # author -> seq of their newest update that was not pushed
+        self.removed = {}        # name -> next seq when that user was removed
+        self.next_seq = 1
+
+    def post(self, author, text):
+        update = (self.next_seq, author, text)
+        self.next_seq += 1
+
+        history = self.histories.get(author)
+        if history is None:
+            history = RingBuffer(self.history_size)
+            self.histories[author] = history
+        history.append(update)
+
+        vertex = self.graph.get_vertex(author)
+        friends = vertex.get_connections() if vertex is not None else []
+
+        if self._fans_out(len(friends)):
+            for nbr in friends:
+                self._timeline(nbr.get_id()).append(update)
+            # back under the threshold: stop pulling once the unpushed
+            # updates have aged out of the history
+            last_unpushed = self.celebrities.get(author)
+            if last_unpushed is not None and history.get(history.size() - 1)[0] > last_unpushed:
+                del self.celebrities[author]
+        else:
+            self.celebrities[author] = update[0]
+
+        return update[0]
+
+    def get_history(self, name, limit=20, before=None):
+        # Newest first; pass the seq of the last update seen as before to page
+        history = self.histories.get(name)
+        if history is None:
+            return []
+        return list(islice(self._iter_ring(history, before), limit))
+
+    def get_timeline(self, name, limit=20, before=None):
+        # Home timeline: own updates plus friends' updates, newest first
+        vertex = self.graph.get_vertex(name)
+        if vertex is None:
+            return []
+
+        sources = []
+        own = self.histories.get(name)
+        if own is not None:
+            sources.append(own)
+
+        if self.strategy == "pull":
+            for nbr in vertex.get_connections():
+                history = self.histories.get(nbr.get_id())
+                if history is not None:
+                    sources.append(history)
+        else:
+            timeline = self.timelines.get(name)
+            if timeline is not None:
+                sources.append(timeline)
+            # celebrity posts were not pushed, pull them from their history
+            for author in self._celebrity_friends(name, vertex):
+                sources.append(self.histories[author])
+
+        merged = heapq.merge(
+            *(self._iter_ring(ring, before) for ring in sources),
+            key=lambda update: update[0],
+            reverse=True
+        )
+
+        page = []
+        last_seq = None
+        for update in merged:
+            # a celebrity that dropped under the threshold can appear twice
+            if update[0] == last_seq:
+                continue
+            last_seq = update[0]
+            # pushed copies stay in the timeline after an unfriend or removal
+            if update[1] != name and not self.graph.has_edge(name, update[1]):
+                continue
+            # a new user with a removed user's name does not inherit its posts
+            if update[0] < self.removed.get(update[1], 0):
+                continue
+            page.append(update)
+            if len(page) >= limit:
+                break
+        return page
+
+    def remove_user(self, name):
+        self.removed[name] = self.next_seq
+        self.histories.pop(name, None)
+        self.timelines.pop(name, None)
+        self.celebrities.pop(name, None)
+
+    def _celebrity_friends(self, name, vertex):
+        # checks whichever is smaller: the celebrities or name's friends
+        friends = vertex.get_connections()
+        if len(self.celebrities) <= len(friends):
+            return [a for a in self.celebrities
+                    if a != name and self.graph.has_edge(name, a)]
+        return [f.get_id() for f in friends if f.get_id() in self.celebrities]
+
+    def _fans_out(self, degree):
+        if self.strategy == "push":
+            return True
+        if self.strategy == "pull":
+            return False
+        return degree <= self.celebrity_threshold
+
+    def _timeline(self, name):
+        timeline = self.timelines.get(name)
+        if timeline is None:
+            timeline = RingBuffer(self.timeline_size)
+            self.timelines[name] = timeline
+        return timeline
+
+    def _iter_ring(self, ring, before=None):
+        # Yields updates newest first, starting at the first one older than before
+        start = 0
+        if before is not None:
+            # seqs decrease as the index grows, binary search for seq < before
+            lo, hi = 0, ring.size()
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if ring.get(mid)[0] < before:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            start = lo
+        for i in range(start, ring.size()):
+            yield ring.get(i)
@@ -1,7 +1,15 @@
 import csv
+import os
+from contextlib import nullcontext
 
+from csv_sync import (PROFILE_FIELDS, MemoryImportStore, fields_fingerprint, make_entry,
+                      parse_changed, parse_profile_row, read_csv_records, scan_records,
+                      split_entry)
 from linked_adts import LinkedDictionary
 from graph_adt import UndirectedGraph
+from news_feed import NewsFeed
+from reach_sketch import ReachEstimator, exact_reach
+from two_hop_index import TwoHopIndex
 from user_profile import UserProfile
 
 
@@ -9,13 +17,38 @@ class ProfileManager:
     # Runtime notes (high level):
     # add_profile: O(1) average
     # get_profile: O(1) average
+    # remove_profile: O(deg * friends per profile)
     # connect_profiles: O(1) average
+    # disconnect_profiles: O(friends per profile)
     # display_profiles: O(n)
-    # get_friends_of_friends: O(V + E)
-
-    def __init__(self):
-        self.profiles = LinkedDictionary()   # name -> UserProfile
-        self.graph = UndirectedGraph()       # relationships
+    # get_friends_of_friends: O(V + E), see TwoHopIndex when enabled
+    # post_status: see NewsFeed
+    # estimate_reach: see ReachEstimator, O(V + E) exact BFS when disabled
+    # sync_profiles_from_csv: O(rows) to hash, parsing and graph work only for changed rows
+
+    def __init__(self, backend=None, feed_strategy="hybrid", celebrity_threshold=1000):
+        # backend: optional storage backend (see sqlite_store.SQLiteBackend)
+        # that provides profiles and graph; defaults to in-memory ADTs
+        # feed_strategy, celebrity_threshold: see news_feed.NewsFeed
+        self.backend = backend
+        if backend is None:
+            self.profiles = LinkedDictionary()   # name -> UserProfile
+            self.graph = UndirectedGraph()       # relationships
+            self.imports = MemoryImportStore()   # CSV sync state, see csv_sync.py
+        else:
+            self.profiles = backend.profiles
+            self.graph = backend.graph
+            self.imports = backend.imports
+        self.feed = NewsFeed(self.graph, strategy=feed_strategy,
+                             celebrity_threshold=celebrity_threshold)   # status updates
+        self.reach = None                    # optional ReachEstimator
+        self.two_hop = None                  # optional TwoHopIndex
+
+    def batch(self):
+        # Groups writes into one transaction when the backend supports it
+        if self.backend is None:
+            return nullcontext()
+        return self.backend.batch()
 
     def add_profile(self, name, location, relationship_status, age,
                     occupation, astrological_sign, status=""):
@@ -34,31 +67,32 @@ class ProfileManager:
 
         self.profiles.add(name, profile)
         self.graph.add_vertex(name)
+        if self.reach is not None:
+            self.reach.add_vertex(name)
         return True
 
     def get_profile(self, name):
         return self.profiles.get_value(name)
 
     def remove_profile(self, name):
-        # Remove the profile from the dictionary and rebuild the graph
+        # Remove the profile and its vertex, then unfriend it from its neighbors
 
         if self.profiles.get_value(name) is None:
             return False
 
-        self.profiles.remove(name)
-
-        remaining_names = self.profiles.get_keys()
-        old_edges = self.graph.get_edges()
-
-        self.graph.clear()
-        for n in remaining_names:
-            self.graph.add_vertex(n)
-
-        for u, v, w in old_edges:
-            if u != name and v != name:
-                self.graph.add_edge(u, v, w)
+        vertex = self.graph.get_vertex(name)
+        friend_names = [nbr.get_id() for nbr in vertex.get_connections()] if vertex is not None else []
 
-        for n in remaining_names:
+        self.profiles.remove(name)
+        self.imports.forget(name)
+        self.feed.remove_user(name)
+        self.graph.remove_vertex(name)
+        if self.reach is not None:
+            self.reach.invalidate()
+        if self.two_hop is not None:
+            self.two_hop.on_vertex_removed(name, friend_names)
+
+        for n in friend_names:
             profile = self.profiles.get_value(n)
             if profile is not None:
                 profile.remove_friend(name)
@@ -74,12 +108,66 @@ class ProfileManager:
         if p1 is None or p2 is None:
             return False
 
+        is_new = not self.graph.has_edge(name1, name2)
         self.graph.add_edge(name1, name2, weight)
         p1.add_friend(name2)
         p2.add_friend(name1)
+        if self.reach is not None:
+            self.reach.add_edge(name1, name2)
+        if self.two_hop is not None and is_new:
+            self.two_hop.on_edge_added(name1, name2)
+
+        return True
+
+    def disconnect_profiles(self, name1, name2):
+        # Remove a friendship connection between two profiles
+
+        if not self.graph.remove_edge(name1, name2):
+            return False
+        if self.reach is not None:
+            self.reach.invalidate()
+        if self.two_hop is not None:
+            self.two_hop.on_edge_removed(name1, name2)
+
+        for name, friend in ((name1, name2), (name2, name1)):
+            profile = self.profiles.get_value(name)
+            if profile is not None:
+                profile.remove_friend(friend)
+
+        return True
+
+    def update_profile(self, name, **attrs):
+        # Overwrites the given attributes, e.g. update_profile("Bob", age=36)
+
+        profile = self.profiles.get_value(name)
+        if profile is None:
+            return False
 
+        for key, value in attrs.items():
+            if key not in PROFILE_FIELDS:
+                raise ValueError(f"Unknown profile field: {key}")
+            setattr(profile, key, value)
+        self.profiles.add(name, profile)   # write back for storage backends
         return True
 
+    def post_status(self, name, status):
+        # Sets the profile's current status and records it in the news feed
+
+        profile = self.profiles.get_value(name)
+        if profile is None:
+            return False
+
+        profile.set_status(status)
+        self.profiles.add(name, profile)   # write back for storage backends
+        self.feed.post(name, status)
+        return True
+
+    def get_status_history(self, name, limit=20, before=None):
+        return self.feed.get_history(name, limit, before)
+
+    def get_news_feed(self, name, limit=20, before=None):
+        return self.feed.get_timeline(name, limit, before)
+
     def display_profiles(self):
         # Returns all profile names
         return self.profiles.get_keys()
@@ -92,7 +180,12 @@ class ProfileManager:
         profile.print_details()
 
     def get_friends_of_friends(self, name):
-        # Friends-of-friends = neighbors of neighbors minus direct friends
+        # Friends-of-friends = neighbors of neighbors minus direct friends.
+        # With a degree-capped two-hop index, people reached only through a
+        # hub are left out (see TwoHopIndex).
+
+        if self.two_hop is not None:
+            return self.two_hop.friends_of_friends(name)
 
         if not self.graph.contains(name):
             return []
@@ -116,6 +209,47 @@ class ProfileManager:
 
         return sorted(fof)
 
+    def enable_two_hop_index(self, degree_cap=None):
+        # Precomputes friends-of-friends; see two_hop_index.py. The default
+        # index is exact, a degree_cap changes answers next to hubs
+        self.two_hop = TwoHopIndex(self.graph, degree_cap)
+        self.two_hop.build()
+        return self.two_hop
+
+    def get_mutual_friend_count(self, name1, name2):
+        if self.two_hop is not None:
+            return self.two_hop.mutual_friend_count(name1, name2)
+
+        v1 = self.graph.get_vertex(name1)
+        v2 = self.graph.get_vertex(name2)
+        if v1 is None or v2 is None or name1 == name2:
+            return 0
+        friends1 = set(nbr.get_id() for nbr in v1.get_connections())
+        friends2 = set(nbr.get_id() for nbr in v2.get_connections())
+        return len(friends1 & friends2)
+
+    def get_friend_suggestions(self, name, limit=10):
+        # Friends-of-friends as (name, mutual friend count), most mutual first
+        if self.two_hop is not None:
+            counts = self.two_hop.mutual_friend_counts(name)
+        else:
+            counts = {fof: self.get_mutual_friend_count(name, fof)
+                      for fof in self.get_friends_of_friends(name)}
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def enable_reach_estimator(self, precision=8, max_hops=3, exact_limit=1000):
+        # Keeps HyperLogLog sketches for estimate_reach; see reach_sketch.py
+        self.reach = ReachEstimator(self.graph, precision, max_hops, exact_limit)
+        return self.reach
+
+    def estimate_reach(self, name, hops=3):
+        # Number of people within hops of name; approximate when the
+        # estimator is enabled and the neighborhood is large, exact otherwise
+        if self.reach is not None and hops <= self.reach.max_hops:
+            return self.reach.reach(name, hops)
+        return exact_reach(self.graph, name, hops)
+
     def read_profiles_from_csv(self, file_path):
         # Expected header:
         # name,status,picture,location,relationship_status,age,occupation,astrological_sign,friends
@@ -123,47 +257,132 @@ class ProfileManager:
 
         rows = []
 
-        with open(file_path, newline="", encoding="utf-8") as f:
+        with open(file_path, newline="", encoding="utf-8") as f, self.batch():
             reader = csv.DictReader(f)
             for row in reader:
-                rows.append(row)
-                name = row.get("name", "").strip()
+                name, attrs, friends = parse_profile_row(row)
                 if not name:
                     continue
-
-                status = row.get("status", "").strip()
-                location = row.get("location", "").strip()
-                relationship_status = row.get("relationship_status", "").strip()
-                occupation = row.get("occupation", "").strip()
-                astrological_sign = row.get("astrological_sign", "").strip()
-
-                age_raw = row.get("age", "").strip()
-                try:
-                    age = int(age_raw) if age_raw else 0
-                except ValueError:
-                    age = 0
+                rows.append((name, friends))
 
                 if self.profiles.get_value(name) is None:
-                    self.add_profile(
-                        name,
-                        location,
-                        relationship_status,
-                        age,
-                        occupation,
-                        astrological_sign,
-                        status
-                    )
-
-        for row in rows:
-            name = row.get("name", "").strip()
-            friends_str = row.get("friends", "").strip()
-            if not name or not friends_str:
-                continue
-
-            for friend in friends_str.split("|"):
-                friend = friend.strip()
-                if self.profiles.get_value(friend) is not None:
-                    self.connect_profiles(name, friend)
+                    self.add_profile(name, **attrs)
+
+        with self.batch():
+            for name, friends in rows:
+                for friend in friends:
+                    if self.profiles.get_value(friend) is not None:
+                        self.connect_profiles(name, friend)
+
+    def sync_profiles_from_csv(self, file_path):
+        # Incremental re-import: compares a hash of each raw record with the
+        # ones saved in self.imports by the previous sync of this file, and
+        # only parses and applies rows that were added, changed or removed.
+        # The first sync of a file into this store loads everything.
+        # Returns a dict of counts.
+
+        header, header_fp, records = read_csv_records(file_path)
+        if "name" not in header:
+            raise ValueError("CSV has no name column")
+
+        source = os.path.abspath(file_path)
+        old_header_fp, known, entries = self.imports.load(source)
+        if old_header_fp != header_fp:
+            # columns changed: keep the entries, but parse every row
+            known.clear()
+
+        matched, changed = scan_records(records, known)
+        pending = parse_changed(header, records, changed, matched)
+        removed = [name for name in entries if name not in matched and name not in pending]
+
+        summary = {"added": 0, "changed": 0, "removed": 0, "unchanged": len(matched),
+                   "edges_added": 0, "edges_removed": 0}
+        with self.batch():
+            for name in removed:
+                if self.remove_profile(name):
+                    summary["removed"] += 1
+                self._sync_forget(known, entries, name)
+            self._sync_apply(pending, known, entries, summary)
+            self.imports.save(source, header_fp, known, entries, pending, removed)
+        return summary
+
+    def _sync_apply(self, pending, known, entries, summary):
+        # Applies parsed rows and records their entries
+        added = set()          # names this file did not track before
+        friends_changed = []   # (name, new friends, old friends)
+
+        for name, (record_fp, attrs, friends) in pending.items():
+            attrs_fp = fields_fingerprint(attrs[key] for key in PROFILE_FIELDS)
+            friends_fp = fields_fingerprint(sorted(friends))
+
+            prev = None
+            if name in entries:
+                if self.graph.contains(name):
+                    prev = split_entry(entries[name])
+                self._sync_forget(known, entries, name)
+            entries[name] = make_entry(record_fp, attrs_fp, friends_fp, friends)
+            known[record_fp] = name
+
+            if prev is None:
+                added.add(name)
+                if self.add_profile(name, **attrs):
+                    summary["added"] += 1
+                else:
+                    # created by hand or another import, not by this file
+                    self.update_profile(name, **attrs)
+                    summary["changed"] += 1
+            else:
+                summary["changed"] += 1
+                if prev[1] != attrs_fp:
+                    self.update_profile(name, **attrs)
+
+            if prev is None or prev[2] != friends_fp:
+                friends_changed.append((name, friends, prev[3] if prev is not None else []))
+
+        def friends_in_file(name):
+            if name in pending:
+                return pending[name][2]
+            entry = entries.get(name)
+            return split_entry(entry)[3] if entry is not None else []
+
+        for name, friends, old_friends in friends_changed:
+            old_friends = set(old_friends)
+            for friend in friends:
+                # an old friend may only exist again now
+                if friend in old_friends and friend not in added:
+                    continue
+                if self._sync_connect(name, friend):
+                    summary["edges_added"] += 1
+            for friend in old_friends - set(friends):
+                # the edge stays if the friend's own row still lists us
+                if name in friends_in_file(friend):
+                    continue
+                if self.disconnect_profiles(name, friend):
+                    summary["edges_removed"] += 1
+
+        if added:
+            # rows whose friends were not applied above may list a
+            # profile that was only just added or taken over
+            applied = {name for name, _, _ in friends_changed}
+            for name in entries:
+                if name in applied:
+                    continue
+                for friend in friends_in_file(name):
+                    if friend in added and self._sync_connect(name, friend):
+                        summary["edges_added"] += 1
+
+    @staticmethod
+    def _sync_forget(known, entries, name):
+        entry = entries.pop(name, None)
+        if entry is not None:
+            record_fp = entry.partition("\t")[0]
+            if known.get(record_fp) == name:
+                del known[record_fp]
+
+    def _sync_connect(self, name, friend):
+        if self.profiles.get_value(friend) is None or self.graph.has_edge(name, friend):
+            return False
+        return self.connect_profiles(name, friend)
 
     def create_user_graph(self, current_user, depth=1, out_path="AliceNetwork"):
         # Creates a graph of the current user's network within N hops
@@ -175,13 +394,12 @@ class ProfileManager:
 
         nodes = {current_user}
         frontier = {current_user}
-        edges_list = self.graph.get_edges()
         edges = []
+        seen_edges = set()
         for _ in range(depth):
             next_frontier = set()
             for name in frontier:
                 vertex = self.graph.get_vertex(name)
-                vertex_id = vertex.get_id()
                 if vertex is None:
                     continue
                 for nbr in vertex.get_connections():
@@ -189,27 +407,24 @@ class ProfileManager:
                     if nbr_name not in nodes:
                         nodes.add(nbr_name)
                         next_frontier.add(nbr_name)
-                    if (vertex_id,nbr_name,0) in edges_list:
-                        edges.append((vertex_id,nbr_name,0))
+                    # store each undirected edge once, smaller name first
+                    edge = (name, nbr_name) if name <= nbr_name else (nbr_name, name)
+                    if edge not in seen_edges:
+                        seen_edges.add(edge)
+                        edges.append((edge[0], edge[1], vertex.get_weight(nbr)))
             frontier = next_frontier
 
         try:
-            from graphviz import Digraph
+            from graphviz import Graph
 
-            g = Digraph("Network", format="png")
+            g = Graph("Network", format="png")
             g.attr(label=f"{current_user}'s Network (depth={depth})", labelloc="t")
 
             for n in sorted(nodes):
                 g.node(n)
 
-            drawn = set()
             for u, v, w in edges:
                 g.edge(u, v, label=str(w) if w not in (None, 0) else None)
-                drawn.add((u, v))
-                # Only draw reverse edge if it exists in the data
-                if (v, u) in edges and (v, u) not in drawn:
-                    g.edge(v, u, label=str(w) if w not in (None, 0) else None)
-                    drawn.add((v, u))
 
             output_file = g.render(filename=out_path, cleanup=True)
             print("Wrote:", output_file)
@@ -225,7 +440,7 @@ class ProfileManager:
                 for n in sorted(nodes):
                     f.write(f'  "{n}";\n')
                 for u, v, w in edges:
-                    label = f' [label="{w}"]' if w not in (None, 0) else None
+                    label = f' [label="{w}"]' if w not in (None, 0) else ""
                     f.write(f'  "{u}" -- "{v}"{label};\n')
                 f.write("}\n")
 
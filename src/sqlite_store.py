@@ -0,0 +1,381 @@
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from graph_adt import UndirectedGraph
+from user_profile import UserProfile
+
+
+# SQLite storage backend for ProfileManager.
+#
+# Usage:
+#   backend = SQLiteBackend("network.db")
+#   pm = ProfileManager(backend=backend)
+#
+# backend.profiles has the LinkedDictionary interface and backend.graph has
+# the UndirectedGraph interface, so ProfileManager and main.py work unchanged.
+# Profiles are loaded lazily and kept in an LRU cache; each vertex's
+# adjacency is kept in a second LRU cache. Writes commit right away unless
+# they happen inside "with backend.batch():", which commits once at the end.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    status TEXT,
+    picture TEXT,
+    location TEXT,
+    relationship_status TEXT,
+    age INTEGER,
+    occupation TEXT,
+    astrological_sign TEXT
+);
+CREATE TABLE IF NOT EXISTS vertices (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS edges (
+    src TEXT NOT NULL,
+    dst TEXT NOT NULL,
+    weight,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (src, dst)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS csv_imports (
+    source TEXT PRIMARY KEY,
+    header_fp TEXT
+);
+CREATE TABLE IF NOT EXISTS csv_import_rows (
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    entry TEXT NOT NULL,
+    PRIMARY KEY (source, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS csv_import_rows_name ON csv_import_rows (name);
+"""
+
+
+class LRUCache:
+    # Runtime:
+    # get: O(1)
+    # put: O(1)
+    # pop: O(1)
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = OrderedDict()
+
+    def get(self, key):
+        value = self.items.get(key)
+        if value is not None:
+            self.items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+
+    def pop(self, key):
+        return self.items.pop(key, None)
+
+    def clear(self):
+        self.items.clear()
+
+
+class SQLiteBackend:
+    def __init__(self, path, profile_cache_size=10000, adjacency_cache_size=10000):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+        self.batch_depth = 0
+        self.profiles = SQLiteProfileStore(self, profile_cache_size)
+        self.graph = SQLiteGraph(self, adjacency_cache_size)
+        self.imports = SQLiteImportStore(self)
+
+    @contextmanager
+    def batch(self):
+        # Groups all writes inside the block into one transaction
+        self.batch_depth += 1
+        try:
+            yield self
+        except Exception:
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                self.conn.rollback()
+                # cached rows may no longer match the database
+                self.profiles.cache.clear()
+                self.graph.reload()
+            raise
+        self.batch_depth -= 1
+        if self.batch_depth == 0:
+            self.conn.commit()
+
+    def execute(self, sql, params=()):
+        return self.conn.execute(sql, params)
+
+    def write(self, sql, params=()):
+        cur = self.conn.execute(sql, params)
+        if self.batch_depth == 0:
+            self.conn.commit()
+        return cur
+
+    def write_many(self, sql, rows):
+        cur = self.conn.executemany(sql, rows)
+        if self.batch_depth == 0:
+            self.conn.commit()
+        return cur
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class SQLiteProfileStore:
+    # Same interface as LinkedDictionary: name -> UserProfile
+    # Runtime:
+    # add: O(log n)
+    # get_value: O(1) cached, O(log n + deg) from disk
+    # remove: O(log n)
+
+    def __init__(self, backend, cache_size):
+        self.backend = backend
+        self.cache = LRUCache(cache_size)
+
+    def add(self, key, value):
+        self.backend.write(
+            "INSERT INTO profiles (name, status, picture, location, relationship_status,"
+            " age, occupation, astrological_sign) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET status = excluded.status,"
+            " picture = excluded.picture, location = excluded.location,"
+            " relationship_status = excluded.relationship_status, age = excluded.age,"
+            " occupation = excluded.occupation,"
+            " astrological_sign = excluded.astrological_sign",
+            (key, value.status, value.picture, value.location, value.relationship_status,
+             value.age, value.occupation, value.astrological_sign)
+        )
+        self.cache.put(key, value)
+
+    def remove(self, key):
+        self.backend.write("DELETE FROM profiles WHERE name = ?", (key,))
+        self.cache.pop(key)
+
+    def get_value(self, key):
+        profile = self.cache.get(key)
+        if profile is not None:
+            return profile
+
+        row = self.backend.execute(
+            "SELECT name, location, relationship_status, age, occupation,"
+            " astrological_sign, status, picture FROM profiles WHERE name = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        profile = UserProfile(*row)
+        # friends are not stored twice, they come from the edge table
+        for (friend,) in self.backend.execute(
+                "SELECT dst FROM edges WHERE src = ? ORDER BY seq", (key,)):
+            if friend != key:
+                profile.add_friend(friend)
+        self.cache.put(key, profile)
+        return profile
+
+    def get_keys(self):
+        # streams names in insertion order
+        for (name,) in self.backend.execute("SELECT name FROM profiles ORDER BY rowid"):
+            yield name
+
+
+class SQLiteImportStore:
+    # Same interface as csv_sync.MemoryImportStore; the import state is kept
+    # in the same database as the profiles it describes
+    # Runtime:
+    # load: O(rows of that file)
+    # save: O(changed + removed rows)
+    # forget: O(log n)
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def load(self, source):
+        row = self.backend.execute(
+            "SELECT header_fp FROM csv_imports WHERE source = ?", (source,)).fetchone()
+        if row is None:
+            return None, {}, {}
+        entries = dict(self.backend.execute(
+            "SELECT name, entry FROM csv_import_rows WHERE source = ?", (source,)))
+        known = {entry.partition("\t")[0]: name for name, entry in entries.items()}
+        return row[0], known, entries
+
+    def save(self, source, header_fp, known, entries, changed, removed):
+        with self.backend.batch():
+            self.backend.write(
+                "INSERT OR REPLACE INTO csv_imports (source, header_fp) VALUES (?, ?)",
+                (source, header_fp))
+            self.backend.write_many(
+                "DELETE FROM csv_import_rows WHERE source = ? AND name = ?",
+                [(source, name) for name in removed])
+            self.backend.write_many(
+                "INSERT OR REPLACE INTO csv_import_rows (source, name, entry) VALUES (?, ?, ?)",
+                [(source, name, entries[name]) for name in changed])
+
+    def forget(self, name):
+        self.backend.write("DELETE FROM csv_import_rows WHERE name = ?", (name,))
+
+
+class SQLiteVertex:
+    # Lightweight handle with the Vertex interface; adjacency is read
+    # through the graph's LRU cache on demand
+
+    def __init__(self, key, graph):
+        self.id = key
+        self.graph = graph
+
+    def __eq__(self, other):
+        return isinstance(other, SQLiteVertex) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    @property
+    def connected_to(self):
+        return {SQLiteVertex(nbr, self.graph): weight
+                for nbr, weight in self.graph.adjacency(self.id).items()}
+
+    def add_neighbor(self, nbr, weight=0):
+        self.graph.add_edge(self.id, nbr.get_id(), weight)
+
+    def get_connections(self):
+        return self.connected_to.keys()
+
+    def get_id(self):
+        return self.id
+
+    def get_weight(self, nbr):
+        return self.graph.adjacency(self.id).get(nbr.get_id(), None)
+
+
+class SQLiteGraph(UndirectedGraph):
+    # Same interface as UndirectedGraph. Each undirected edge is stored as
+    # two rows (src, dst) so a vertex's adjacency is one index range scan.
+    # Runtime:
+    # add_vertex / add_edge: O(log E)
+    # get_vertex / contains: O(1) cached, O(log V) from disk
+    # adjacency: O(1) cached, O(log E + deg) from disk
+    # remove_edge: O(log E)
+    # remove_vertex: O(deg * log E)
+
+    def __init__(self, backend, cache_size):
+        self.backend = backend
+        self.cache = LRUCache(cache_size)   # name -> {neighbor name: weight}
+        self.vert_list = None               # vertices live in the database
+        self.reload()
+
+    def reload(self):
+        self.cache.clear()
+        self.num_vertices = self.backend.execute("SELECT COUNT(*) FROM vertices").fetchone()[0]
+        # edges keep their insertion order, like the in-memory adjacency dicts
+        self.next_seq = self.backend.execute("SELECT MAX(seq) FROM edges").fetchone()[0] or 0
+
+    def adjacency(self, key):
+        adj = self.cache.get(key)
+        if adj is None:
+            adj = {dst: weight for dst, weight in self.backend.execute(
+                "SELECT dst, weight FROM edges WHERE src = ? ORDER BY seq", (key,))}
+            self.cache.put(key, adj)
+        return adj
+
+    def add_vertex(self, key):
+        cur = self.backend.write("INSERT OR IGNORE INTO vertices (name) VALUES (?)", (key,))
+        if cur.rowcount > 0:
+            self.num_vertices += 1
+            self.cache.put(key, {})
+        return SQLiteVertex(key, self)
+
+    def get_vertex(self, key):
+        if not self.contains(key):
+            return None
+        return SQLiteVertex(key, self)
+
+    def add_edge(self, from_key, to_key, weight=0):
+        # undirected: add both directions
+        self.add_vertex(from_key)
+        self.add_vertex(to_key)
+        self.next_seq += 1
+        # an existing edge keeps its place and only gets the new weight
+        self.backend.write_many(
+            "INSERT INTO edges (src, dst, weight, seq) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT(src, dst) DO UPDATE SET weight = excluded.weight",
+            [(from_key, to_key, weight, self.next_seq), (to_key, from_key, weight, self.next_seq)]
+        )
+        for a, b in ((from_key, to_key), (to_key, from_key)):
+            adj = self.cache.get(a)
+            if adj is not None:
+                adj[b] = weight
+
+    def has_edge(self, from_key, to_key):
+        return self.contains(from_key) and to_key in self.adjacency(from_key)
+
+    def remove_edge(self, from_key, to_key):
+        if not self.has_edge(from_key, to_key):
+            return False
+
+        self.backend.write_many(
+            "DELETE FROM edges WHERE src = ? AND dst = ?",
+            [(from_key, to_key), (to_key, from_key)]
+        )
+        for a, b in ((from_key, to_key), (to_key, from_key)):
+            adj = self.cache.get(a)
+            if adj is not None:
+                adj.pop(b, None)
+        return True
+
+    def remove_vertex(self, key):
+        if not self.contains(key):
+            return False
+
+        neighbors = list(self.adjacency(key))
+        for nbr in neighbors:
+            adj = self.cache.get(nbr)
+            if adj is not None:
+                adj.pop(key, None)
+
+        # reverse rows are deleted by primary key, dst has no index of its own
+        self.backend.write_many("DELETE FROM edges WHERE src = ? AND dst = ?",
+                                [(nbr, key) for nbr in neighbors])
+        self.backend.write("DELETE FROM edges WHERE src = ?", (key,))
+        self.backend.write("DELETE FROM vertices WHERE name = ?", (key,))
+        self.cache.pop(key)
+        self.num_vertices -= 1
+        return True
+
+    def get_vertices(self):
+        return list(self.iter_vertices())
+
+    def iter_vertices(self):
+        for (name,) in self.backend.execute("SELECT name FROM vertices ORDER BY rowid"):
+            yield name
+
+    def contains(self, key):
+        if self.cache.get(key) is not None:
+            return True
+        row = self.backend.execute("SELECT 1 FROM vertices WHERE name = ?", (key,)).fetchone()
+        return row is not None
+
+    def clear(self):
+        self.backend.write("DELETE FROM edges")
+        self.backend.write("DELETE FROM vertices")
+        self.cache.clear()
+        self.num_vertices = 0
+
+    def iter_edges(self):
+        # Yields each undirected edge once as (from, to, weight) with from <= to
+        cur = self.backend.execute(
+            "SELECT src, dst, weight FROM edges WHERE src <= dst ORDER BY src, dst")
+        for row in cur:
+            yield row
@@ -0,0 +1,164 @@
+class TwoHopIndex:
+    # Precomputed friends-of-friends with mutual-friend counts.
+    #
+    # pairs[a][b] = number of mutual friends of a and b. A vertex with more
+    # than degree_cap friends (a hub) is not counted as a mutual friend in
+    # pairs, because it would add deg^2 entries and every edge change would
+    # touch all of its friends.
+    #
+    # Queries do not walk hubs either: friends_of_friends only returns people
+    # who share at least one non-hub friend with name, so someone reachable
+    # only through a hub is left out. Listing a hub's whole friend list would
+    # make every query next to a hub cost O(hub degree). Mutual friend counts
+    # still include hubs, so the counts that are returned are exact.
+    # degree_cap=None has no hubs and matches a full traversal.
+    #
+    # The graph must already reflect a change when the matching on_* method
+    # is called.
+    #
+    # Runtime notes (d = degree, capped at degree_cap for non-hubs):
+    # build: O(sum of d^2)
+    # on_edge_added / on_edge_removed: O(d(u) + d(v)), O(cap^2) when a
+    #     vertex crosses the cap
+    # friends_of_friends: O(d + candidates * hub friends)
+    # mutual_friend_count: O(1) + O(hub friends)
+
+    def __init__(self, graph, degree_cap=None):
+        # degree_cap=None (the default) indexes every vertex
+        self.graph = graph
+        self.degree_cap = degree_cap
+        self.pairs = {}    # name -> {name: mutual friend count}
+        self.hubs = set()  # vertices with more than degree_cap friends
+
+    def build(self):
+        self.pairs = {}
+        self.hubs = set()
+        for key in self.graph.iter_vertices():
+            nbrs = self._neighbors(key)
+            if self._is_hub(len(nbrs)):
+                self.hubs.add(key)
+            else:
+                self._add_pairs(nbrs, 1)
+
+    def on_edge_added(self, u, v):
+        if u == v:
+            return
+        for m, other in ((u, v), (v, u)):
+            nbrs = self._neighbors(m)
+            if self._is_hub(len(nbrs)):
+                if not self._is_hub(len(nbrs) - 1):
+                    # m just became a hub: drop the pairs it was counted in
+                    self.hubs.add(m)
+                    self._add_pairs([w for w in nbrs if w != other], -1)
+            else:
+                for w in nbrs:
+                    if w != other:
+                        self._change(other, w, 1)
+                        self._change(w, other, 1)
+
+    def on_edge_removed(self, u, v):
+        if u == v:
+            return
+        for m, other in ((u, v), (v, u)):
+            nbrs = self._neighbors(m)
+            if self._is_hub(len(nbrs) + 1):
+                if not self._is_hub(len(nbrs)):
+                    # m dropped back under the cap: count its pairs again
+                    self.hubs.discard(m)
+                    self._add_pairs(nbrs, 1)
+            else:
+                for w in nbrs:
+                    self._change(other, w, -1)
+                    self._change(w, other, -1)
+
+    def on_vertex_removed(self, name, former_neighbors):
+        # former_neighbors: name's friends before the vertex was removed
+        if name in self.hubs:
+            self.hubs.discard(name)
+        else:
+            self._add_pairs(former_neighbors, -1)
+
+        for w in former_neighbors:
+            if w == name:
+                continue
+            nbrs = self._neighbors(w)
+            if self._is_hub(len(nbrs) + 1):
+                if not self._is_hub(len(nbrs)):
+                    self.hubs.discard(w)
+                    self._add_pairs(nbrs, 1)
+            else:
+                for x in nbrs:
+                    self._change(x, name, -1)
+
+        self.pairs.pop(name, None)
+
+    def friends_of_friends(self, name):
+        return sorted(self.mutual_friend_counts(name))
+
+    def mutual_friend_counts(self, name):
+        # name -> mutual friend count for every friend-of-friend of name that
+        # shares a non-hub friend with it
+        if not self.graph.contains(name):
+            return {}
+
+        direct = set(self._neighbors(name))
+        counts = dict(self.pairs.get(name, {}))
+        for friend in direct:
+            counts.pop(friend, None)
+        counts.pop(name, None)
+
+        # hubs only add to the counts of candidates found above
+        for hub in self._hub_friends(name, direct):
+            for x in counts:
+                if self.graph.has_edge(hub, x):
+                    counts[x] += 1
+        return counts
+
+    def mutual_friend_count(self, a, b):
+        count = self.pairs.get(a, {}).get(b, 0)
+        if not self.hubs or a == b or not self.graph.contains(a):
+            return count
+        for hub in self._hub_friends(a):
+            if self.graph.has_edge(hub, b):
+                count += 1
+        return count
+
+    def _hub_friends(self, name, direct=None):
+        # checks whichever is smaller: the hubs or name's friends
+        if direct is None:
+            vertex = self.graph.get_vertex(name)
+            if len(self.hubs) <= len(vertex.get_connections()):
+                return [h for h in self.hubs if self.graph.has_edge(name, h)]
+            direct = self._neighbors(name)
+        if len(self.hubs) < len(direct):
+            return [h for h in self.hubs if h in direct]
+        return [f for f in direct if f in self.hubs]
+
+    def _neighbors(self, key):
+        vertex = self.graph.get_vertex(key)
+        if vertex is None:
+            return []
+        return [nbr.get_id() for nbr in vertex.get_connections()]
+
+    def _is_hub(self, degree):
+        return self.degree_cap is not None and degree > self.degree_cap
+
+    def _add_pairs(self, nbrs, delta):
+        # every two friends of one vertex share it as a mutual friend
+        for a in nbrs:
+            for b in nbrs:
+                if a != b:
+                    self._change(a, b, delta)
+
+    def _change(self, a, b, delta):
+        counts = self.pairs.get(a)
+        if counts is None:
+            counts = {}
+            self.pairs[a] = counts
+        count = counts.get(b, 0) + delta
+        if count > 0:
+            counts[b] = count
+        else:
+            counts.pop(b, None)
+            if not counts:
+                del self.pairs[a]
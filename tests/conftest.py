@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the modules import each other by plain name from src/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -0,0 +1,70 @@
+import builtins
+import io
+import json
+
+import pytest
+
+from batch import parse_command, run_batch
+import main
+from profile_manager import ProfileManager
+
+
+def test_export_takes_fmt(tmp_path):
+    path = str(tmp_path / "network.out")
+    out = io.StringIO()
+    lines = ["add_profile A", "add_profile B", "connect A B", f"export {path} fmt=dot"]
+
+    errors = run_batch(ProfileManager(), lines, out)
+
+    assert errors == 0
+    assert json.loads(out.getvalue().splitlines()[-1])["result"] == path
+    with open(path, encoding="utf-8") as f:
+        assert f.readline().startswith("graph")
+
+
+def test_positional_arguments():
+    assert parse_command("export net.bin bin") == ("export", {"path": "net.bin", "fmt": "bin"})
+
+
+def test_bad_output_path_closes_input(tmp_path, monkeypatch):
+    inp = tmp_path / "commands.txt"
+    inp.write_text("profiles\n", encoding="utf-8")
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        f = builtins.open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr(main, "open", tracking_open, raising=False)
+    with pytest.raises(OSError):
+        main.run_batch_file(ProfileManager(), str(inp), str(tmp_path / "missing" / "out.jsonl"))
+
+    assert opened and all(f.closed for f in opened)
+
+
+def test_only_argument_names_are_keywords():
+    assert parse_command('post_status A "x=y"') == ("post_status", {"name": "A", "status": "x=y"})
+    assert parse_command("post_status A status=x=y") == (
+        "post_status", {"name": "A", "status": "x=y"})
+    with pytest.raises(ValueError):
+        parse_command("remove A weight=2")
+
+
+@pytest.mark.parametrize("line", [
+    "enable_two_hop degree_cap=",
+    "enable_two_hop degree_cap=none",
+    "enable_two_hop None",
+    '{"cmd": "enable_two_hop", "degree_cap": null}',
+])
+def test_enable_two_hop_without_cap(line):
+    pm = ProfileManager()
+
+    assert run_batch(pm, [line], io.StringIO()) == 0
+    assert pm.two_hop.degree_cap is None
+
+
+def test_enable_two_hop_with_cap():
+    pm = ProfileManager()
+    assert run_batch(pm, ["enable_two_hop degree_cap=5"], io.StringIO()) == 0
+    assert pm.two_hop.degree_cap == 5
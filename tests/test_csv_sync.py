@@ -0,0 +1,231 @@
+import random
+
+import pytest
+
+from profile_manager import ProfileManager
+from sqlite_store import SQLiteBackend
+
+
+HEADER = "name,status,picture,location,relationship_status,age,occupation,astrological_sign,friends\n"
+
+
+def row(name, age=30, friends="", location="Seattle"):
+    return f"{name},status,,{location},Single,{age},Engineer,Aries,{friends}\n"
+
+
+def write(path, *rows, header=HEADER):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write(header + "".join(rows))
+
+
+def snapshot(pm):
+    profiles = {}
+    for name in pm.display_profiles():
+        p = pm.get_profile(name)
+        profiles[name] = (p.get_location(), p.get_relationship_status(), p.get_age(),
+                          p.get_occupation(), p.get_astrological_sign(), p.get_status(),
+                          sorted(p.get_friends()))
+    edges = sorted((u, v) for u, v, _ in pm.graph.iter_edges())
+    return profiles, edges
+
+
+def full_load(path):
+    pm = ProfileManager()
+    pm.read_profiles_from_csv(path)
+    return snapshot(pm)
+
+
+def test_attribute_change_with_new_friend_profile(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    pm = ProfileManager()
+    write(path, row("A", 30, "B"))
+    pm.sync_profiles_from_csv(path)
+
+    write(path, row("A", 31, "B"), row("B"))
+    summary = pm.sync_profiles_from_csv(path)
+
+    assert pm.graph.has_edge("A", "B")
+    assert snapshot(pm) == full_load(path)
+    assert summary["added"] == 1 and summary["changed"] == 1
+
+
+def test_sync_after_full_load_counts_changes(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    write(path, row("A", friends="B"), row("B"), row("C", friends="A"))
+    pm = ProfileManager()
+    pm.read_profiles_from_csv(path)
+
+    summary = pm.sync_profiles_from_csv(path)
+
+    assert summary["added"] == 0
+    assert summary["changed"] == 3
+    assert snapshot(pm) == full_load(path)
+
+
+def test_unchanged_file_is_not_applied(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    write(path, row("A", friends="B"), row("B"))
+    pm = ProfileManager()
+    pm.sync_profiles_from_csv(path)
+
+    summary = pm.sync_profiles_from_csv(path)
+
+    assert summary == {"added": 0, "changed": 0, "removed": 0, "unchanged": 2,
+                       "edges_added": 0, "edges_removed": 0}
+
+
+def test_missing_name_column(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    write(path, "A,1\n", header="user,age\n")
+
+    with pytest.raises(ValueError, match="no name column"):
+        ProfileManager().sync_profiles_from_csv(path)
+
+
+def test_duplicate_names_without_friends_column(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    write(path, "A,1\n", "A,2\n", header="name,age\n")
+    pm = ProfileManager()
+
+    summary = pm.sync_profiles_from_csv(path)
+
+    assert summary["added"] == 1
+    assert pm.get_profile("A").get_age() == 1
+
+
+def test_quoted_field_over_several_lines(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    pm = ProfileManager()
+    write(path, row("A", friends="B"), 'B,"two\nlines",,Seattle,Single,20,Engineer,Aries,\n')
+    pm.sync_profiles_from_csv(path)
+
+    write(path, row("A", friends="B"), 'B,"two\nlines",,Boston,Single,20,Engineer,Aries,\n')
+    summary = pm.sync_profiles_from_csv(path)
+
+    assert summary["changed"] == 1 and summary["unchanged"] == 1
+    assert pm.get_profile("B").get_location() == "Boston"
+    assert snapshot(pm) == full_load(path)
+
+
+def test_header_change_parses_every_row(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    pm = ProfileManager()
+    write(path, row("A", 30), row("B", 40))
+    pm.sync_profiles_from_csv(path)
+
+    # same lines, but the age and location columns are swapped
+    header = HEADER.replace("location", "tmp").replace("age", "location").replace("tmp", "age")
+    write(path, row("A", 30), row("B", 40), header=header)
+    pm.sync_profiles_from_csv(path)
+
+    assert pm.get_profile("A").get_location() == "30"
+    assert snapshot(pm) == full_load(path)
+
+
+def test_friends_change_reconnects_re_added_friend(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    pm = ProfileManager()
+    write(path, row("A", friends="B"), row("B"))
+    pm.sync_profiles_from_csv(path)
+    write(path, row("A", friends="B"))
+    pm.sync_profiles_from_csv(path)
+
+    write(path, row("A", friends="B|C"), row("B"), row("C"))
+    pm.sync_profiles_from_csv(path)
+
+    assert pm.graph.has_edge("A", "B")
+    assert snapshot(pm) == full_load(path)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_match_full_load(tmp_path, seed):
+    path = str(tmp_path / "profiles.csv")
+    rng = random.Random(seed)
+    names = [f"user{i}" for i in range(25)]
+    rows = {}
+    pm = ProfileManager()
+
+    for _ in range(25):
+        for name in rng.sample(names, 8):
+            action = rng.random()
+            if action < 0.2:
+                rows.pop(name, None)
+            elif action < 0.5:
+                rows[name] = (rng.randint(18, 80), rows.get(name, (0, ""))[1])
+            else:
+                friends = "|".join(rng.sample(names, rng.randint(0, 4)))
+                rows[name] = (rows.get(name, (30, ""))[0], friends)
+        lines = [row(n, *rows[n]) for n in rows]
+        if lines and rng.random() < 0.3:
+            # a repeated name: first row's attributes, friends from both
+            lines.append(row(rng.choice(list(rows)), 1, rng.choice(names)))
+        rng.shuffle(lines)
+        write(path, *lines)
+
+        pm.sync_profiles_from_csv(path)
+        assert snapshot(pm) == full_load(path)
+
+
+def test_fresh_manager_does_not_trust_earlier_syncs(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    write(path, row("Alice", 30), row("Zed", 40))
+    ProfileManager().sync_profiles_from_csv(path)
+
+    write(path, row("Alice", 30))
+    pm = ProfileManager()
+    pm.add_profile("Zed", "", "", 0, "", "")
+    pm.add_profile("Alice", "Boston", "", 0, "", "")
+    summary = pm.sync_profiles_from_csv(path)
+
+    assert summary["removed"] == 0 and summary["changed"] == 1
+    assert pm.get_profile("Zed") is not None
+    assert pm.get_profile("Alice").get_location() == "Seattle"
+
+
+def test_profile_removed_by_hand_is_loaded_again(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    write(path, row("A", friends="B"), row("B"))
+    pm = ProfileManager()
+    pm.sync_profiles_from_csv(path)
+
+    pm.remove_profile("B")
+    pm.add_profile("B", "Boston", "", 0, "", "")
+    summary = pm.sync_profiles_from_csv(path)
+
+    assert summary["unchanged"] == 1 and summary["changed"] == 1
+    assert snapshot(pm) == full_load(path)
+
+
+def test_sync_state_is_per_file(tmp_path):
+    first = str(tmp_path / "first.csv")
+    second = str(tmp_path / "second.csv")
+    write(first, row("A"))
+    write(second, row("B"))
+    pm = ProfileManager()
+    pm.sync_profiles_from_csv(first)
+
+    summary = pm.sync_profiles_from_csv(second)
+
+    assert summary["added"] == 1 and summary["removed"] == 0
+    assert sorted(pm.display_profiles()) == ["A", "B"]
+
+
+def test_sqlite_keeps_sync_state_across_reopen(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    db = str(tmp_path / "network.db")
+    write(path, row("A", friends="B"), row("B"), row("C", friends="A"))
+    backend = SQLiteBackend(db)
+    ProfileManager(backend=backend).sync_profiles_from_csv(path)
+    backend.close()
+
+    write(path, row("A", friends="B"), row("B", 41), row("D", friends="A"))
+    backend = SQLiteBackend(db)
+    try:
+        pm = ProfileManager(backend=backend)
+        summary = pm.sync_profiles_from_csv(path)
+
+        assert summary == {"added": 1, "changed": 1, "removed": 1, "unchanged": 1,
+                           "edges_added": 1, "edges_removed": 0}
+        assert snapshot(pm) == full_load(path)
+    finally:
+        backend.close()
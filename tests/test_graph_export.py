@@ -0,0 +1,138 @@
+import csv
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from graph_adt import UndirectedGraph
+from graph_export import (export_graph, read_binary, write_binary, write_dot,
+                          write_edge_csv, write_graphml)
+
+
+def small_graph():
+    graph = UndirectedGraph()
+    for key in ("Dana", "Bob", "Alice", "Cy"):
+        graph.add_vertex(key)
+    graph.add_edge("Dana", "Alice", 2)
+    graph.add_edge("Bob", "Alice", 0)
+    graph.add_edge("Bob", "Dana", 1.5)
+    return graph
+
+
+EDGES = {("Alice", "Dana", 2), ("Alice", "Bob", 0), ("Bob", "Dana", 1.5)}
+
+
+def test_iter_edges_yields_each_edge_once():
+    edges = list(small_graph().iter_edges())
+
+    assert len(edges) == len(EDGES)
+    assert set(edges) == EDGES
+    assert all(u <= v for u, v, _ in edges)
+
+
+def test_remove_vertex_drops_its_edges():
+    graph = small_graph()
+
+    assert graph.remove_vertex("Alice")
+    assert not graph.remove_vertex("Alice")
+    assert graph.size() == 3
+    assert not graph.contains("Alice")
+    assert not graph.has_edge("Bob", "Alice")
+    assert list(graph.iter_edges()) == [("Bob", "Dana", 1.5)]
+
+
+def test_write_edge_csv(tmp_path):
+    path = str(tmp_path / "net.csv")
+
+    # chunk_size=1 flushes after every edge
+    assert write_edge_csv(small_graph(), path, chunk_size=1) == 3
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["from", "to", "weight"]
+    assert {tuple(row) for row in rows[1:]} == {(u, v, str(w)) for u, v, w in EDGES}
+
+
+def test_write_dot(tmp_path):
+    path = str(tmp_path / "net.dot")
+    graph = small_graph()
+    graph.add_vertex('Say "hi"')
+
+    write_dot(graph, path, name="Net", chunk_size=2)
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == 'graph "Net" {'
+    assert lines[-1] == "}"
+    assert '  "Cy";' in lines
+    assert '  "Say \\"hi\\"";' in lines
+    assert '  "Alice" -- "Dana" [label="2"];' in lines
+    # zero weights get no label
+    assert '  "Alice" -- "Bob";' in lines
+    assert sum(" -- " in line for line in lines) == 3
+
+
+def test_write_graphml(tmp_path):
+    path = str(tmp_path / "net.graphml")
+    graph = small_graph()
+    graph.add_vertex("<Eve & Co>")
+
+    write_graphml(graph, path)
+
+    ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+    root = ET.parse(path).getroot()
+    nodes = [node.get("id") for node in root.iterfind("g:graph/g:node", ns)]
+    edges = {(edge.get("source"), edge.get("target"), edge.find("g:data", ns).text)
+             for edge in root.iterfind("g:graph/g:edge", ns)}
+    assert nodes == ["Dana", "Bob", "Alice", "Cy", "<Eve & Co>"]
+    assert edges == {(u, v, str(w)) for u, v, w in EDGES}
+
+
+def test_binary_round_trip(tmp_path):
+    path = str(tmp_path / "net.bin")
+    graph = small_graph()
+    graph.add_vertex("Zoë")
+    graph.add_edge("Zoë", "Cy", 7)
+
+    assert write_binary(graph, path, chunk_size=2) == 4
+    loaded = read_binary(path, chunk_size=3)
+
+    assert loaded.get_vertices() == graph.get_vertices()
+    assert sorted(loaded.iter_edges()) == sorted(graph.iter_edges())
+    # whole-number weights come back as ints
+    assert all(type(w) is type(v) for (_, _, w), (_, _, v)
+               in zip(sorted(loaded.iter_edges()), sorted(graph.iter_edges())))
+
+
+def test_read_binary_rejects_other_files(tmp_path):
+    path = tmp_path / "net.bin"
+    path.write_bytes(b"not a graph at all")
+
+    with pytest.raises(ValueError):
+        read_binary(str(path))
+
+
+def test_export_graph_picks_writer(tmp_path):
+    graph = small_graph()
+
+    export_graph(graph, str(tmp_path / "net.dot"))
+    export_graph(graph, str(tmp_path / "net.GraphML"))
+    export_graph(graph, str(tmp_path / "net"))
+    export_graph(graph, str(tmp_path / "net.out"), fmt="bin")
+
+    with open(tmp_path / "net.dot", encoding="utf-8") as f:
+        assert f.readline().startswith("graph")
+    with open(tmp_path / "net.GraphML", encoding="utf-8") as f:
+        assert f.readline().startswith("<?xml")
+    with open(tmp_path / "net", encoding="utf-8") as f:
+        assert f.readline().strip() == "from,to,weight"
+    assert sorted(read_binary(str(tmp_path / "net.out")).iter_edges()) == sorted(EDGES)
+
+
+@pytest.mark.parametrize("name, fmt", [("net.json", None), ("net.png", None), ("net.csv", "xml")])
+def test_export_graph_rejects_unknown_formats(tmp_path, name, fmt):
+    path = tmp_path / name
+
+    with pytest.raises(ValueError):
+        export_graph(small_graph(), str(path), fmt)
+    assert not os.path.exists(path)
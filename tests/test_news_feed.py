@@ -0,0 +1,99 @@
+import pytest
+
+from linked_adts import RingBuffer
+from news_feed import NewsFeed
+from profile_manager import ProfileManager
+
+
+STRATEGIES = ["push", "pull", "hybrid"]
+
+
+def make_pm(strategy, celebrity_threshold=1000):
+    pm = ProfileManager(feed_strategy=strategy, celebrity_threshold=celebrity_threshold)
+    for name in ("A", "B", "C"):
+        pm.add_profile(name, "", "", 0, "", "")
+    pm.connect_profiles("A", "B")
+    pm.connect_profiles("A", "C")
+    return pm
+
+
+def texts(page):
+    return [text for _, _, text in page]
+
+
+def test_ring_buffer_overwrites_oldest():
+    ring = RingBuffer(3)
+    for i in range(5):
+        ring.append(i)
+
+    assert ring.size() == 3
+    assert [ring.get(i) for i in range(3)] == [4, 3, 2]
+    assert ring.get(3) is None
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        ProfileManager(feed_strategy="fanout")
+    with pytest.raises(ValueError):
+        NewsFeed(None, strategy="fanout")
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_timeline_pages_newest_first(strategy):
+    pm = make_pm(strategy)
+    for i in range(5):
+        pm.post_status("B", f"b{i}")
+        pm.post_status("A", f"a{i}")
+
+    page = pm.get_news_feed("A", limit=4)
+    rest = pm.get_news_feed("A", limit=20, before=page[-1][0])
+
+    assert texts(page + rest) == ["a4", "b4", "a3", "b3", "a2", "b2", "a1", "b1", "a0", "b0"]
+    assert texts(pm.get_status_history("B", limit=2)) == ["b4", "b3"]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_disconnect_hides_former_friend(strategy):
+    pm = make_pm(strategy)
+    pm.post_status("B", "hello")
+    pm.post_status("C", "hi")
+
+    pm.disconnect_profiles("A", "B")
+
+    assert texts(pm.get_news_feed("A")) == ["hi"]
+    assert texts(pm.get_news_feed("B")) == ["hello"]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_removed_user_posts_do_not_come_back(strategy):
+    pm = make_pm(strategy)
+    pm.post_status("B", "old secret")
+
+    pm.remove_profile("B")
+    assert pm.get_news_feed("A") == []
+
+    pm.add_profile("B", "", "", 0, "", "")
+    pm.connect_profiles("A", "B")
+    pm.post_status("B", "new")
+
+    assert texts(pm.get_news_feed("A")) == ["new"]
+
+
+def test_hybrid_pulls_celebrity_posts():
+    pm = make_pm("hybrid", celebrity_threshold=1)
+    pm.post_status("A", "from A")   # two friends: pulled, not pushed
+    pm.post_status("B", "from B")   # one friend: pushed
+
+    assert "A" in pm.feed.celebrities
+    assert pm.feed.timelines.get("B") is None
+    assert texts(pm.get_news_feed("B")) == ["from B", "from A"]
+    assert texts(pm.get_news_feed("C")) == ["from A"]
+
+
+def test_celebrity_back_under_threshold_is_not_duplicated():
+    pm = make_pm("hybrid", celebrity_threshold=1)
+    pm.post_status("A", "pulled")
+    pm.disconnect_profiles("A", "C")
+    pm.post_status("A", "pushed")
+
+    assert texts(pm.get_news_feed("B")) == ["pushed", "pulled"]
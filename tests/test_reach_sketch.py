@@ -0,0 +1,140 @@
+import random
+
+import pytest
+
+from profile_manager import ProfileManager
+from reach_sketch import ReachEstimator, exact_reach
+
+
+def sketches(estimator):
+    # name -> registers at every radius, independent of index order
+    return {name: [level[i] for level in estimator.levels]
+            for name, i in estimator.index.items()}
+
+
+def fresh_sketches(pm, **kwargs):
+    estimator = ReachEstimator(pm.graph, **kwargs)
+    estimator.build()
+    return sketches(estimator)
+
+
+def random_network(seed, num_users=40, num_edges=60):
+    rng = random.Random(seed)
+    pm = ProfileManager()
+    names = [f"user{i}" for i in range(num_users)]
+    for name in names:
+        pm.add_profile(name, "", "", 0, "", "")
+    for _ in range(num_edges):
+        pm.connect_profiles(*rng.sample(names, 2))
+    return rng, pm, names
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_add_edge_matches_fresh_build(seed):
+    rng, pm, names = random_network(seed)
+    estimator = pm.enable_reach_estimator(precision=6, max_hops=3, exact_limit=0)
+    estimator.build()
+
+    for step in range(80):
+        if rng.random() < 0.2:
+            name = f"new{step}"
+            pm.add_profile(name, "", "", 0, "", "")
+            names.append(name)
+        pm.connect_profiles(*rng.sample(names, 2))
+        if step % 10 == 9:
+            assert sketches(estimator) == fresh_sketches(pm, precision=6, max_hops=3)
+
+
+def test_connect_to_vertex_added_before_build():
+    pm = ProfileManager()
+    estimator = pm.enable_reach_estimator(precision=6, max_hops=2, exact_limit=0)
+    for name in ("A", "B", "C"):
+        pm.add_profile(name, "", "", 0, "", "")
+    pm.connect_profiles("A", "B")
+    # nothing is kept before the first build
+    assert estimator.levels is None
+
+    estimator.build()
+    pm.add_profile("D", "", "", 0, "", "")
+    pm.connect_profiles("C", "D")
+    pm.connect_profiles("B", "C")
+    assert sketches(estimator) == fresh_sketches(pm, precision=6, max_hops=2)
+
+
+def test_disconnect_and_remove_invalidate():
+    _, pm, names = random_network(1)
+    estimator = pm.enable_reach_estimator(precision=6, max_hops=2, exact_limit=0)
+
+    estimator.build()
+    friend = pm.get_profile(names[0]).get_friends()[0]
+    pm.disconnect_profiles(names[0], friend)
+    assert estimator.levels is None
+    estimator.reach(names[0])
+    assert sketches(estimator) == fresh_sketches(pm, precision=6, max_hops=2)
+
+    pm.remove_profile(names[1])
+    assert estimator.levels is None
+    assert names[1] not in estimator.reach_all()
+    assert estimator.reach(names[1]) == 0
+    assert sketches(estimator) == fresh_sketches(pm, precision=6, max_hops=2)
+
+
+def test_small_neighborhoods_are_counted_exactly():
+    _, pm, names = random_network(2)
+    estimator = pm.enable_reach_estimator(max_hops=3, exact_limit=1000)
+
+    for name in names:
+        for hops in range(4):
+            assert pm.estimate_reach(name, hops) == exact_reach(pm.graph, name, hops)
+    # every answer came from BFS, so no sketches were built
+    assert estimator.levels is None
+
+
+def test_large_neighborhoods_fall_back_to_sketches():
+    _, pm, names = random_network(3, num_users=200, num_edges=400)
+    estimator = pm.enable_reach_estimator(max_hops=3, exact_limit=5)
+
+    assert exact_reach(pm.graph, names[0], 3, limit=5) is None
+    pm.estimate_reach(names[0], 3)
+    assert estimator.levels is not None
+
+
+def test_exact_reach_limit():
+    pm = ProfileManager()
+    for name in ("A", "B", "C", "D"):
+        pm.add_profile(name, "", "", 0, "", "")
+    pm.connect_profiles("A", "B")
+    pm.connect_profiles("B", "C")
+    pm.connect_profiles("C", "D")
+
+    assert exact_reach(pm.graph, "A", 2) == 2
+    assert exact_reach(pm.graph, "A", 3, limit=3) == 3
+    assert exact_reach(pm.graph, "A", 3, limit=2) is None
+    assert exact_reach(pm.graph, "Nobody", 3) == 0
+
+
+def test_estimates_are_close_to_exact():
+    _, pm, names = random_network(4, num_users=1500, num_edges=2500)
+    estimator = pm.enable_reach_estimator(precision=10, max_hops=3, exact_limit=0)
+
+    for hops in (1, 2, 3):
+        estimates = estimator.reach_all(hops)
+        errors = []
+        for name in names[:100]:
+            exact = exact_reach(pm.graph, name, hops)
+            # loose per-vertex bound; relative error is about 3% at precision 10
+            assert abs(estimates[name] - exact) <= 0.15 * exact + 3
+            if exact >= 100:
+                errors.append(abs(estimates[name] - exact) / exact)
+        if errors:
+            assert sum(errors) / len(errors) < 0.06
+
+
+def test_bad_arguments():
+    pm = ProfileManager()
+    with pytest.raises(ValueError):
+        ReachEstimator(pm.graph, precision=3)
+    with pytest.raises(ValueError):
+        ReachEstimator(pm.graph, max_hops=0)
+    with pytest.raises(ValueError):
+        ReachEstimator(pm.graph, max_hops=2).reach("A", 3)
@@ -0,0 +1,168 @@
+import os
+import sqlite3
+
+import pytest
+
+from profile_manager import ProfileManager
+from sqlite_store import LRUCache, SQLiteBackend
+
+
+DATA_CSV = os.path.join(os.path.dirname(__file__), "..", "data", "profiles.csv")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "network.db")
+
+
+def open_backend(path):
+    # tiny caches so every flow reads through to the database
+    return SQLiteBackend(path, profile_cache_size=2, adjacency_cache_size=2)
+
+
+def snapshot(pm):
+    profiles = {}
+    for name in pm.display_profiles():
+        p = pm.get_profile(name)
+        profiles[name] = (p.get_location(), p.get_relationship_status(), p.get_age(),
+                          p.get_occupation(), p.get_astrological_sign(), p.get_status(),
+                          p.picture, list(p.get_friends()))
+    edges = sorted(pm.graph.iter_edges())
+    return profiles, edges
+
+
+def run_flows(pm):
+    results = {}
+    pm.read_profiles_from_csv(DATA_CSV)
+    results["loaded"] = snapshot(pm)
+    results["fof"] = {name: pm.get_friends_of_friends(name) for name in pm.display_profiles()}
+    results["bfs"] = pm.graph.bfs("Alice")
+    results["mutual"] = pm.get_mutual_friend_count("Alice", "Dana")
+
+    pm.connect_profiles("Alice", "Frank", 3)
+    pm.disconnect_profiles("Bob", "Dana")
+    pm.remove_profile("Charlie")
+    pm.post_status("Eve", "Gone fishing")
+    results["edited"] = snapshot(pm)
+    results["fof_edited"] = pm.get_friends_of_friends("Alice")
+    results["size"] = pm.graph.size()
+    return results
+
+
+def test_flows_match_memory(db_path):
+    backend = open_backend(db_path)
+    try:
+        sqlite_results = run_flows(ProfileManager(backend=backend))
+    finally:
+        backend.close()
+
+    assert sqlite_results == run_flows(ProfileManager())
+
+
+def test_state_survives_reopen(db_path):
+    backend = open_backend(db_path)
+    pm = ProfileManager(backend=backend)
+    run_flows(pm)
+    expected = snapshot(pm)
+    order = pm.graph.bfs("Alice")
+    backend.close()
+
+    backend = open_backend(db_path)
+    try:
+        pm = ProfileManager(backend=backend)
+        assert snapshot(pm) == expected
+        # neighbors come back in the order they were connected
+        assert pm.graph.bfs("Alice") == order
+        assert pm.get_profile("Eve").get_status() == "Gone fishing"
+        assert pm.get_profile("Charlie") is None
+        assert pm.graph.size() == len(expected[0])
+    finally:
+        backend.close()
+
+
+def test_reconnect_keeps_edge_position(db_path):
+    backend = open_backend(db_path)
+    try:
+        pms = [ProfileManager(backend=backend), ProfileManager()]
+        for pm in pms:
+            for name in ("A", "B", "C"):
+                pm.add_profile(name, "", "", 0, "", "")
+            pm.connect_profiles("A", "B", 1)
+            pm.connect_profiles("A", "C", 1)
+            pm.connect_profiles("A", "B", 5)
+        orders = [[(v.get_id(), pm.graph.get_vertex("A").get_weight(v))
+                   for v in pm.graph.get_vertex("A").get_connections()] for pm in pms]
+        assert orders[0] == orders[1] == [("B", 5), ("C", 1)]
+    finally:
+        backend.close()
+
+
+def test_remove_vertex_deletes_both_edge_rows(db_path):
+    backend = open_backend(db_path)
+    try:
+        pm = ProfileManager(backend=backend)
+        pm.read_profiles_from_csv(DATA_CSV)
+
+        pm.remove_profile("Alice")
+
+        rows = backend.execute(
+            "SELECT COUNT(*) FROM edges WHERE src = 'Alice' OR dst = 'Alice'").fetchone()[0]
+        assert rows == 0
+        assert "Alice" not in pm.get_profile("Bob").get_friends()
+        assert not pm.graph.has_edge("Bob", "Alice")
+    finally:
+        backend.close()
+
+
+def test_failed_batch_rolls_back(db_path):
+    backend = open_backend(db_path)
+    try:
+        pm = ProfileManager(backend=backend)
+        pm.read_profiles_from_csv(DATA_CSV)
+        before = snapshot(pm)
+
+        with pytest.raises(RuntimeError):
+            with pm.batch():
+                pm.add_profile("Zed", "", "", 0, "", "")
+                pm.connect_profiles("Zed", "Alice")
+                pm.remove_profile("Bob")
+                pm.update_profile("Dana", age=99)
+                raise RuntimeError("abort")
+
+        # caches were reset, so this reads the database again
+        assert snapshot(pm) == before
+        assert pm.graph.size() == len(before[0])
+        assert pm.get_profile("Zed") is None
+    finally:
+        backend.close()
+
+
+def test_batch_commits_once(db_path):
+    backend = open_backend(db_path)
+    try:
+        pm = ProfileManager(backend=backend)
+        with pm.batch():
+            pm.add_profile("A", "", "", 0, "", "")
+            with pm.batch():
+                pm.add_profile("B", "", "", 0, "", "")
+            # the inner block does not commit on its own
+            other = sqlite3.connect(db_path)
+            assert other.execute("SELECT COUNT(*) FROM profiles").fetchone()[0] == 0
+            other.close()
+        other = sqlite3.connect(db_path)
+        assert other.execute("SELECT COUNT(*) FROM profiles").fetchone()[0] == 2
+        other.close()
+    finally:
+        backend.close()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.pop("a") == 1 and cache.get("a") is None
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from profile_manager import ProfileManager
+from two_hop_index import TwoHopIndex
+
+
+def neighbors(pm, name):
+    return set(pm.get_profile(name).get_friends())
+
+
+def traversal_counts(pm, name, degree_cap):
+    # mutual friend counts by traversal, limited to friends-of-friends that
+    # share a non-hub friend with name
+    direct = neighbors(pm, name)
+    counts = {}
+    via_non_hub = set()
+    for friend in direct:
+        friend_nbrs = neighbors(pm, friend)
+        is_hub = degree_cap is not None and len(friend_nbrs) > degree_cap
+        for x in friend_nbrs:
+            counts[x] = counts.get(x, 0) + 1
+            if not is_hub:
+                via_non_hub.add(x)
+    return {x: c for x, c in counts.items()
+            if x != name and x not in direct and x in via_non_hub}
+
+
+def random_network(seed, num_users=30):
+    rng = random.Random(seed)
+    pm = ProfileManager()
+    names = [f"user{i}" for i in range(num_users)]
+    for name in names:
+        pm.add_profile(name, "", "", 0, "", "")
+    for _ in range(num_users * 2):
+        pm.connect_profiles(*rng.sample(names, 2))
+    # one hub friends with half the network
+    for friend in rng.sample(names[1:], num_users // 2):
+        pm.connect_profiles(names[0], friend)
+    return rng, pm, names
+
+
+def check(pm, names, degree_cap):
+    for name in pm.display_profiles():
+        assert pm.two_hop.mutual_friend_counts(name) == traversal_counts(pm, name, degree_cap)
+        assert pm.get_friends_of_friends(name) == sorted(traversal_counts(pm, name, degree_cap))
+        for other in names:
+            expected = 0
+            if pm.get_profile(other) is not None and other != name:
+                expected = len(neighbors(pm, name) & neighbors(pm, other))
+            assert pm.get_mutual_friend_count(name, other) == expected
+
+    fresh = TwoHopIndex(pm.graph, degree_cap)
+    fresh.build()
+    assert pm.two_hop.pairs == fresh.pairs
+    assert pm.two_hop.hubs == fresh.hubs
+
+
+@pytest.mark.parametrize("degree_cap", [None, 5, 10])
+def test_index_matches_traversal_after_updates(degree_cap):
+    rng, pm, names = random_network(degree_cap or 0)
+    pm.enable_two_hop_index(degree_cap)
+    check(pm, names, degree_cap)
+
+    for step in range(60):
+        action = rng.random()
+        a, b = rng.sample(names, 2)
+        if action < 0.4:
+            pm.connect_profiles(a, b)
+        elif action < 0.8:
+            friends = sorted(neighbors(pm, a)) if pm.get_profile(a) is not None else []
+            if friends:
+                pm.disconnect_profiles(a, rng.choice(friends))
+        elif pm.get_profile(a) is not None:
+            pm.remove_profile(a)
+        else:
+            pm.add_profile(a, "", "", 0, "", "")
+        if step % 10 == 9:
+            check(pm, names, degree_cap)
+
+
+def test_uncapped_index_matches_plain_traversal():
+    _, pm, names = random_network(3)
+    expected = {name: pm.get_friends_of_friends(name) for name in names}
+
+    pm.enable_two_hop_index(None)
+
+    assert {name: pm.get_friends_of_friends(name) for name in names} == expected
+
+
+def test_hub_only_friends_are_left_out():
+    pm = ProfileManager()
+    for name in ("A", "H", "X", "Y", "Z"):
+        pm.add_profile(name, "", "", 0, "", "")
+    for friend in ("A", "X", "Y", "Z"):
+        pm.connect_profiles("H", friend)
+    pm.enable_two_hop_index(degree_cap=3)
+
+    assert pm.get_friends_of_friends("A") == []
+
+    pm.add_profile("B", "", "", 0, "", "")
+    pm.connect_profiles("A", "B")
+    pm.connect_profiles("B", "X")
+
+    # X shares B (not a hub) with A; H still counts as a mutual friend
+    assert pm.two_hop.mutual_friend_counts("A") == {"X": 2}